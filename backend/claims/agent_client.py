@@ -0,0 +1,18 @@
+"""Shared HTTP client for calls to the agent service."""
+import atexit
+import functools
+
+import httpx
+from django.conf import settings
+
+
+@functools.lru_cache(maxsize=None)
+def get_agent_client():
+    """Return the process-wide keep-alive client for the agent service."""
+    client = httpx.Client(
+        base_url=settings.AGENT_SERVICE_URL,
+        timeout=120.0,
+        limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+    )
+    atexit.register(client.close)
+    return client
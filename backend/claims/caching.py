@@ -0,0 +1,45 @@
+"""Cache keys and invalidation helpers for cached API payloads."""
+from django.core.cache import cache
+
+DASHBOARD_VERSION_KEY = 'dashboard:version'
+# Global dashboard payload kept current by the ``refresh_dashboard_metrics`` beat task.
+# Not versioned: it is a periodic summary, so writes do not evict it.
+DASHBOARD_SUMMARY_KEY = 'dashboard:summary'
+
+
+# Roles whose dashboard is built from global data only, so one entry serves them all
+_SHARED_DASHBOARD_ROLES = ('admin', 'manager')
+
+
+def _dashboard_version():
+    return cache.get_or_set(DASHBOARD_VERSION_KEY, 1, timeout=None)
+
+
+def dashboard_cache_key(user_id, role):
+    """Dashboard key scoped to the current dashboard version.
+
+    Management dashboards are identical for every user of the role and share
+    one key; everyone else gets a per-user key.
+    """
+    scope = 'all' if role in _SHARED_DASHBOARD_ROLES else user_id
+    return f'dashboard:{_dashboard_version()}:{role}:{scope}'
+
+
+def analytics_cache_key(days):
+    """Analytics report key; the report is global, so it only varies by period."""
+    return f'analytics:{_dashboard_version()}:{days}'
+
+
+def bump_dashboard_version():
+    """Invalidate every cached dashboard at once; old keys expire on their own TTL.
+
+    The model save/delete signals call this for ordinary writes. Queryset
+    ``update()`` and ``bulk_create()`` send no signals, so code that changes
+    dashboard data that way calls it too. Callers schedule it with
+    ``transaction.on_commit`` so a poll racing the write cannot cache
+    pre-commit numbers under the new version.
+    """
+    try:
+        cache.incr(DASHBOARD_VERSION_KEY)
+    except ValueError:
+        cache.set(DASHBOARD_VERSION_KEY, 1, timeout=None)
@@ -0,0 +1,179 @@
+"""Dashboard and analytics payload builders.
+
+Shared by the API views, which cache the payloads, and by the periodic
+``refresh_dashboard_metrics`` task, which keeps the management dashboards
+warm and records the headline numbers as ``DashboardMetric`` snapshots.
+"""
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db.models import Avg, Count, DecimalField, FloatField, Q, Sum
+from django.db.models.functions import Cast, Coalesce, TruncMonth
+from django.utils import timezone
+
+from .models import Claim, DashboardMetric, FraudAlert
+from .permissions import MANAGEMENT_ROLES, STAFF_ROLES
+from .serializers import ClaimListSerializer
+
+_STATUSES = tuple(s for s, _ in Claim.STATUS_CHOICES)
+_LOSS_TYPES = tuple(t for t, _ in Claim.LOSS_TYPE_CHOICES)
+_PRIORITIES = tuple(p for p, _ in Claim.PRIORITY_CHOICES)
+_PENDING_STATUSES = ('submitted', 'under_review', 'ai_processing', 'pending_info')
+_APPROVED_STATUSES = ('approved', 'partially_approved')
+# Claims that no longer need an adjuster
+_INACTIVE_STATUSES = ('draft', 'closed', 'settled')
+
+# DashboardMetric.metric_name -> key in the dashboard payload
+_SNAPSHOT_METRICS = {
+    'claims_total': 'total_claims',
+    'claims_approved': 'approved_claims',
+    'claims_denied': 'denied_claims',
+    'claims_pending': 'pending_claims',
+    'total_payout': 'total_payout',
+    'avg_processing_time': 'avg_processing_time_hours',
+    'fraud_detected': 'fraud_alerts_count',
+}
+
+
+def build_dashboard(user, role):
+    """Role-aware dashboard payload.
+
+    Management roles see global data only, so ``user`` is not consulted for them.
+    """
+    now = timezone.now()
+    thirty_days_ago = now - timedelta(days=30)
+    personal = role in ('adjuster', 'reviewer')
+
+    # Scope claims by role
+    if role in MANAGEMENT_ROLES:
+        claims = Claim.objects.all()
+    elif role in ('adjuster', 'reviewer', 'agent'):
+        claims = Claim.objects.all()
+    else:
+        claims = Claim.objects.filter(claimant=user)
+
+    recent_claims = claims.filter(created_at__gte=thirty_days_ago)
+
+    monthly_trend = list(
+        claims.filter(created_at__gte=now - timedelta(days=365))
+        .annotate(month=TruncMonth('created_at'))
+        .values('month')
+        .annotate(
+            count=Count('id'),
+            total_amount=Cast(
+                Coalesce(Sum('estimated_repair_cost'), 0, output_field=DecimalField()), FloatField(),
+            ),
+        )
+        .order_by('month')
+    )
+
+    pending_q = Q(status__in=_PENDING_STATUSES)
+    counters = {}
+    if personal:
+        counters['mine'] = Count('id', filter=Q(assigned_adjuster=user))
+        counters['mine_pending'] = Count('id', filter=Q(assigned_adjuster=user) & pending_q)
+    # One pass over the scoped claims for every headline counter
+    totals = claims.aggregate(
+        total=Count('id'),
+        pending=Count('id', filter=pending_q),
+        approved=Count('id', filter=Q(status__in=_APPROVED_STATUSES)),
+        denied=Count('id', filter=Q(status='denied')),
+        unassigned=Count(
+            'id', filter=Q(assigned_adjuster__isnull=True) & ~Q(status__in=_INACTIVE_STATUSES),
+        ),
+        total_payout=Sum('settlement_amount'),
+        avg_seconds=Avg('processing_duration_seconds', filter=Q(status='settled')),
+        # Per-status and per-type breakdowns ride along instead of two GROUP BY queries
+        **{f'status_{s}': Count('id', filter=Q(status=s)) for s in _STATUSES},
+        **{f'type_{t}': Count('id', filter=Q(loss_type=t)) for t in _LOSS_TYPES},
+        **counters,
+    )
+    # Only categories that occur, as the grouped queries returned
+    status_counts = {s: n for s in _STATUSES if (n := totals[f'status_{s}'])}
+    type_counts = {t: n for t in _LOSS_TYPES if (n := totals[f'type_{t}'])}
+    avg_time = totals['avg_seconds'] / 3600 if totals['avg_seconds'] else 0
+
+    data = {
+        'role': role,
+        'total_claims': totals['total'],
+        'pending_claims': totals['pending'],
+        'approved_claims': totals['approved'],
+        'denied_claims': totals['denied'],
+        'total_payout': float(totals['total_payout'] or 0),
+        'avg_processing_time_hours': avg_time,
+        'fraud_alerts_count': FraudAlert.objects.filter(status='open').count(),
+        'claims_by_status': status_counts,
+        'claims_by_type': type_counts,
+        'recent_claims': ClaimListSerializer(
+            recent_claims.with_list_data().order_by('-created_at')[:10], many=True
+        ).data,
+        'monthly_trend': monthly_trend,
+    }
+
+    # Add role-specific data
+    if personal:
+        my_claims = Claim.objects.filter(assigned_adjuster=user)
+        data['my_claims_count'] = totals['mine']
+        data['my_pending_count'] = totals['mine_pending']
+        data['my_recent_claims'] = ClaimListSerializer(
+            my_claims.with_list_data().order_by('-updated_at')[:5], many=True
+        ).data
+    elif role in MANAGEMENT_ROLES:
+        users = User.objects.aggregate(
+            total=Count('id'),
+            staff=Count('id', filter=Q(profile__role__in=STAFF_ROLES)),
+            adjusters=Count('id', filter=Q(profile__role='adjuster')),
+        )
+        data['total_users'] = users['total']
+        data['total_staff'] = users['staff']
+        data['total_adjusters'] = users['adjusters']
+        data['unassigned_claims'] = totals['unassigned']
+
+    return data
+
+
+def build_analytics(days):
+    """Global analytics report for claims created in the last ``days`` days."""
+    start_date = timezone.now() - timedelta(days=days)
+    claims = Claim.objects.filter(created_at__gte=start_date)
+
+    totals = claims.aggregate(
+        total=Count('id'),
+        estimated=Sum('estimated_repair_cost'),
+        approved=Sum('approved_amount'),
+        settled=Sum('settlement_amount'),
+        avg_fraud=Avg('fraud_score'),
+        **{f'status_{s}': Count('id', filter=Q(status=s)) for s in _STATUSES},
+        **{f'type_{t}': Count('id', filter=Q(loss_type=t)) for t in _LOSS_TYPES},
+        **{f'priority_{p}': Count('id', filter=Q(priority=p)) for p in _PRIORITIES},
+    )
+
+    return {
+        'period_days': days,
+        'total_claims': totals['total'],
+        'by_status': {s: n for s in _STATUSES if (n := totals[f'status_{s}'])},
+        'by_type': {t: n for t in _LOSS_TYPES if (n := totals[f'type_{t}'])},
+        'by_priority': {p: n for p in _PRIORITIES if (n := totals[f'priority_{p}'])},
+        'total_estimated': float(totals['estimated'] or 0),
+        'total_approved': float(totals['approved'] or 0),
+        'total_settled': float(totals['settled'] or 0),
+        'avg_fraud_score': totals['avg_fraud'],
+        'fraud_alerts': FraudAlert.objects.filter(created_at__gte=start_date).count(),
+    }
+
+
+def record_metric_snapshot(data):
+    """Upsert today's ``DashboardMetric`` rows from a global dashboard payload in one query."""
+    today = timezone.localdate()
+    DashboardMetric.objects.bulk_create(
+        [
+            DashboardMetric(
+                metric_name=name, metric_value=float(data[key]),
+                period_start=today, period_end=today,
+            )
+            for name, key in _SNAPSHOT_METRICS.items()
+        ],
+        update_conflicts=True,
+        unique_fields=['metric_name', 'period_start', 'period_end'],
+        update_fields=['metric_value', 'computed_at'],
+    )
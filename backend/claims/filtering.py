@@ -0,0 +1,41 @@
+"""Filter backend and view mixin for the claims API list endpoints."""
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework.settings import api_settings
+
+# (view class, model) -> FilterSet generated from the view's ``filterset_fields``
+_auto_filtersets = {}
+
+
+class CachedFilterSetBackend(DjangoFilterBackend):
+    """``DjangoFilterBackend`` that generates each view's ``filterset_fields`` FilterSet once.
+
+    The stock backend declares a new FilterSet class, and introspects the
+    model fields for it, on every request.
+    """
+
+    def get_filterset_class(self, view, queryset=None):
+        if getattr(view, 'filterset_class', None) or queryset is None:
+            return super().get_filterset_class(view, queryset)
+        key = (type(view), queryset.model)
+        if key not in _auto_filtersets:
+            _auto_filtersets[key] = super().get_filterset_class(view, queryset)
+        return _auto_filtersets[key]
+
+
+class SkipIdleFiltersMixin:
+    """Run the filter backends only when the request carries one of their parameters.
+
+    Unfiltered list requests, the common case, go straight to the view's
+    default ``ordering`` instead.
+    """
+
+    def filter_queryset(self, queryset):
+        params = {
+            *(getattr(self, 'filterset_fields', None) or ()),
+            api_settings.SEARCH_PARAM,
+            api_settings.ORDERING_PARAM,
+        }
+        if params.intersection(self.request.query_params):
+            return super().filter_queryset(queryset)
+        ordering = getattr(self, 'ordering', None)
+        return queryset.order_by(*ordering) if ordering else queryset
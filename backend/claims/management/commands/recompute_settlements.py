@@ -0,0 +1,11 @@
+"""Recompute claim settlement amounts after a change to payout or deductible rules."""
+from django.core.management.base import BaseCommand
+from claims.models import Claim
+
+
+class Command(BaseCommand):
+    help = 'Reset settlement_amount to max(0, approved - deductible) on every approved claim'
+
+    def handle(self, *args, **options):
+        updated = Claim.objects.recompute_settlements()
+        self.stdout.write(self.style.SUCCESS(f'Recomputed {updated} claim settlements.'))
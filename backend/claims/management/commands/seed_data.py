@@ -35,6 +35,7 @@ class Command(BaseCommand):
             if not AuditLog.objects.exists():
                 self._seed_audit_logs(admin, adjusters)
             self._backfill_processing_logs()
+            self._backfill_display_caches()
             return
 
         self.stdout.write('Seeding database...')
@@ -451,3 +452,9 @@ class Command(BaseCommand):
                 updated += 1
         if updated:
             self.stdout.write(f'  Backfilled processing logs for {updated} claims')
+
+    def _backfill_display_caches(self):
+        """Fill denormalized name/policy columns on claims created before they existed."""
+        updated = Claim.objects.backfill_display_caches()
+        if updated:
+            self.stdout.write(f'  Backfilled display fields for {updated} claims')
@@ -2,10 +2,29 @@
 Models for the AI Insurance Claim Assistant.
 Covers claims lifecycle, policy management, fraud detection, audit trails, and analytics.
 """
+import os
+import time
 import uuid
-from django.db import models
+from decimal import Decimal
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Concat, Extract, Greatest, Trim
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator
+from django.utils import timezone
+
+from .caching import bump_dashboard_version
+
+
+def uuid7():
+    """Time-ordered UUID (RFC 9562 version 7) so new rows append to the pk index."""
+    value = (time.time_ns() // 1_000_000) << 80
+    value |= int.from_bytes(os.urandom(10), 'big') & ((1 << 80) - 1)
+    value &= ~(0xF << 76)
+    value |= 0x7 << 76
+    value &= ~(0x3 << 62)
+    value |= 0x2 << 62
+    return uuid.UUID(int=value)
 
 
 class UserProfile(models.Model):
@@ -28,6 +47,11 @@ class UserProfile(models.Model):
     def __str__(self):
         return f"{self.user.username} ({self.get_role_display()})"
 
+    @staticmethod
+    def cache_key(user_id):
+        """Cache key for the serialized ``/auth/me/`` payload of a user."""
+        return f'profile:{user_id}'
+
 
 class PolicyDocument(models.Model):
     """Insurance policy documents stored and indexed in ChromaDB."""
@@ -84,11 +108,95 @@ class InsurancePolicy(models.Model):
     class Meta:
         ordering = ['-created_at']
         verbose_name_plural = 'Insurance Policies'
+        constraints = [
+            models.CheckConstraint(
+                condition=Q(premium_amount__gte=0) & Q(deductible_amount__gte=0) & Q(coverage_limit__gte=0),
+                name='policy_amounts_nonneg',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.policy_number} - {self.holder.get_full_name()}"
 
 
+class ClaimQuerySet(models.QuerySet):
+    def with_document_count(self):
+        """Annotate ``document_count`` in the same query instead of a COUNT(*) per row.
+
+        A correlated subquery is evaluated only for the rows actually returned
+        (one page) using the ``claim_id`` index, instead of joining every
+        document and grouping the whole filtered set.
+        """
+        documents = (
+            ClaimDocument.objects.filter(claim=OuterRef('pk'))
+            .order_by().values('claim').annotate(count=Count('*')).values('count')
+        )
+        return self.annotate(
+            document_count=Coalesce(Subquery(documents, output_field=models.IntegerField()), 0)
+        )
+
+    def with_list_data(self):
+        """Shape rows for ``ClaimListSerializer``: document count plus only the rendered columns.
+
+        Keeps the JSON blobs (AI log, recommendation, vehicle details) off the wire;
+        the name columns are denormalized, so no joins are needed.
+        """
+        return self.with_document_count().only(
+            'id', 'claim_number', 'claimant_name_cache', 'policy_number_cache',
+            'assigned_adjuster', 'adjuster_name_cache', 'status', 'priority', 'loss_type', 'date_of_loss',
+            'estimated_repair_cost', 'approved_amount', 'settlement_amount',
+            'fraud_score', 'created_at', 'updated_at',
+        )
+
+    def set_status(self, status):
+        """Move the selected claims to ``status`` in a single UPDATE.
+
+        For bare status transitions that need none of ``Claim.save()``'s
+        claim-number or display-cache work.
+        """
+        updated = self.update(status=status, updated_at=timezone.now())
+        if updated:
+            transaction.on_commit(bump_dashboard_version)
+        return updated
+
+    def backfill_display_caches(self):
+        """Fill the denormalized name/policy columns on rows that predate them, in one UPDATE.
+
+        Rows without a cached policy number have never had their caches written.
+        Runs at migrate time (see ``signals``), so it leaves the dashboard cache alone.
+        """
+        def full_name(user_column):
+            # Same as User.get_full_name()
+            return Subquery(
+                User.objects.filter(pk=OuterRef(user_column))
+                .values(name=Trim(Concat('first_name', Value(' '), 'last_name')))[:1]
+            )
+
+        return self.filter(policy_number_cache='').update(
+            policy_number_cache=Subquery(
+                InsurancePolicy.objects.filter(pk=OuterRef('policy_id')).values('policy_number')[:1]
+            ),
+            claimant_name_cache=full_name('claimant_id'),
+            adjuster_name_cache=Coalesce(full_name('assigned_adjuster_id'), Value('')),
+        )
+
+    def recompute_settlements(self):
+        """Reset ``settlement_amount`` to max(0, approved - deductible) in a single UPDATE.
+
+        Set-based counterpart of ``processing.net_settlement`` for batch re-scoring;
+        run by the ``recompute_settlements`` management command.
+        """
+        zero = Value(Decimal('0'))
+        updated = self.filter(approved_amount__isnull=False).update(
+            settlement_amount=Greatest(
+                F('approved_amount') - Coalesce(F('deductible_applied'), zero), zero,
+            ),
+        )
+        if updated:
+            transaction.on_commit(bump_dashboard_version)
+        return updated
+
+
 class Claim(models.Model):
     """Insurance claims with full lifecycle tracking."""
     STATUS_CHOICES = [
@@ -151,12 +259,23 @@ class Claim(models.Model):
     vehicle_details = models.JSONField(default=dict, blank=True)
     third_party_involved = models.BooleanField(default=False)
     police_report_number = models.CharField(max_length=100, blank=True)
+    # Denormalized display fields so claim lists render without joins
+    claimant_name_cache = models.CharField(max_length=200, blank=True)
+    adjuster_name_cache = models.CharField(max_length=200, blank=True)
+    policy_number_cache = models.CharField(max_length=50, blank=True)
     fraud_score = models.FloatField(null=True, blank=True)
     fraud_flags = models.JSONField(default=list, blank=True)
     ai_recommendation = models.JSONField(default=dict, blank=True)
     ai_processing_log = models.JSONField(default=list, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    processing_duration_seconds = models.GeneratedField(
+        expression=Extract(F('updated_at') - F('created_at'), 'epoch'),
+        output_field=models.FloatField(),
+        db_persist=True,
+    )
+
+    objects = ClaimQuerySet.as_manager()
 
     class Meta:
         ordering = ['-created_at']
@@ -164,23 +283,66 @@ class Claim(models.Model):
             models.Index(fields=['status', 'priority']),
             models.Index(fields=['claim_number']),
             models.Index(fields=['date_of_loss']),
+            models.Index(fields=['status', 'processing_duration_seconds']),
+            models.Index(fields=['-created_at']),
+            # An adjuster's most recently touched claims (dashboard "my recent claims")
+            models.Index(fields=['assigned_adjuster', '-updated_at']),
+            # A customer's claims, newest first (claim list, customer dashboard)
+            models.Index(fields=['claimant', '-created_at']),
+            # Status-filtered claim list in its default newest-first order
+            models.Index(fields=['status', '-created_at']),
+        ]
+        # Enforced by Postgres so bulk_create/update() paths that skip validators stay safe
+        constraints = [
+            models.CheckConstraint(
+                condition=(
+                    Q(estimated_repair_cost__gte=0)
+                    & (Q(approved_amount__isnull=True) | Q(approved_amount__gte=0))
+                    & (Q(deductible_applied__isnull=True) | Q(deductible_applied__gte=0))
+                    & (Q(settlement_amount__isnull=True) | Q(settlement_amount__gte=0))
+                ),
+                name='claim_amounts_nonneg',
+            ),
         ]
 
     def __str__(self):
-        return f"{self.claim_number} - {self.get_status_display()}"
+        return f"{self.claim_number} - {_STATUS_DISPLAY.get(self.status, self.status)}"
 
     def save(self, *args, **kwargs):
         if not self.claim_number:
-            last = Claim.objects.order_by('-created_at').first()
+            last_number = Claim.objects.order_by('-created_at').values_list(
+                'claim_number', flat=True
+            ).first()
             num = 1
-            if last and last.claim_number:
+            if last_number:
                 try:
-                    num = int(last.claim_number.split('-')[1]) + 1
+                    num = int(last_number.split('-')[1]) + 1
                 except (IndexError, ValueError):
                     num = Claim.objects.count() + 1
             self.claim_number = f"CLM-{num:06d}"
+        self.refresh_display_cache()
         super().save(*args, **kwargs)
 
+    @property
+    def adjuster_name(self):
+        """Cached adjuster name, or None when unassigned (as the detail view renders it)."""
+        return self.adjuster_name_cache if self.assigned_adjuster_id else None
+
+    def refresh_display_cache(self):
+        """Copy names from already-loaded related rows onto the denormalized columns."""
+        meta = self._meta
+        if meta.get_field('claimant').is_cached(self):
+            self.claimant_name_cache = self.claimant.get_full_name()
+        if meta.get_field('policy').is_cached(self):
+            self.policy_number_cache = self.policy.policy_number
+        if self.assigned_adjuster_id is None:
+            self.adjuster_name_cache = ''
+        elif meta.get_field('assigned_adjuster').is_cached(self):
+            self.adjuster_name_cache = self.assigned_adjuster.get_full_name()
+
+
+_STATUS_DISPLAY = dict(Claim.STATUS_CHOICES)
+
 
 class ClaimDocument(models.Model):
     """Documents attached to claims (photos, invoices, reports)."""
@@ -193,7 +355,7 @@ class ClaimDocument(models.Model):
         ('witness_statement', 'Witness Statement'),
         ('other', 'Other'),
     ]
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     claim = models.ForeignKey(Claim, on_delete=models.CASCADE, related_name='documents')
     document_type = models.CharField(max_length=20, choices=DOC_TYPE_CHOICES, default='other')
     file = models.FileField(upload_to='claims/documents/')
@@ -209,10 +371,15 @@ class ClaimDocument(models.Model):
     def __str__(self):
         return f"{self.filename} ({self.get_document_type_display()})"
 
+    def commit_file(self):
+        """Write a pending upload to storage; required before bulk_create, which skips pre_save."""
+        if self.file and not self.file._committed:
+            self.file.save(self.file.name, self.file.file, save=False)
+
 
 class ClaimNote(models.Model):
     """Notes and comments on claims."""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     claim = models.ForeignKey(Claim, on_delete=models.CASCADE, related_name='notes')
     author = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
     content = models.TextField()
@@ -239,7 +406,7 @@ class AuditLog(models.Model):
         ('settled', 'Settled'),
         ('note_added', 'Note Added'),
     ]
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     claim = models.ForeignKey(Claim, on_delete=models.CASCADE, related_name='audit_logs')
     user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
     action = models.CharField(max_length=20, choices=ACTION_CHOICES)
@@ -271,7 +438,7 @@ class FraudAlert(models.Model):
         ('confirmed', 'Confirmed Fraud'),
         ('dismissed', 'Dismissed'),
     ]
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     claim = models.ForeignKey(Claim, on_delete=models.CASCADE, related_name='fraud_alerts')
     severity = models.CharField(max_length=10, choices=SEVERITY_CHOICES, default='medium')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='open')
@@ -286,6 +453,15 @@ class FraudAlert(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Open-alert count on the dashboard and the status-filtered alert list
+            models.Index(fields=['status', '-created_at']),
+            # Default list ordering and the analytics period count
+            models.Index(fields=['-created_at']),
+        ]
+        constraints = [
+            models.CheckConstraint(condition=Q(ai_confidence__gte=0), name='fraud_alert_confidence_nonneg'),
+        ]
 
 
 class AgentTask(models.Model):
@@ -307,7 +483,7 @@ class AgentTask(models.Model):
         ('document_analyzer', 'Document Analyzer Agent'),
         ('notification', 'Notification Agent'),
     ]
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     claim = models.ForeignKey(Claim, on_delete=models.CASCADE, related_name='agent_tasks')
     agent_type = models.CharField(max_length=30, choices=AGENT_TYPE_CHOICES)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
@@ -336,7 +512,7 @@ class Notification(models.Model):
         ('settlement', 'Settlement Ready'),
         ('system', 'System Notification'),
     ]
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
     notification_type = models.CharField(max_length=20, choices=TYPE_CHOICES)
     title = models.CharField(max_length=255)
@@ -348,6 +524,10 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Partial: mark_all_read and unread counts only touch a user's unread rows
+            models.Index(fields=['user'], condition=Q(is_read=False), name='notification_unread_idx'),
+        ]
 
 
 class DashboardMetric(models.Model):
@@ -0,0 +1,9 @@
+"""Pagination classes for the claims API."""
+from rest_framework.pagination import PageNumberPagination
+
+
+class StandardPagination(PageNumberPagination):
+    """Page-number pagination with a client-selectable but capped page size."""
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
@@ -20,7 +20,11 @@ OVERSIGHT_ROLES = ('admin', 'manager', 'reviewer')    # analytics, fraud, audits
 
 
 def _get_role(user):
-    """Get the role from user's profile, defaulting to 'customer'."""
+    """Get the role from user's profile, defaulting to 'customer'.
+
+    The authentication classes load the profile with the user, so this
+    issues no query for ``request.user``.
+    """
     profile = getattr(user, 'profile', None)
     return profile.role if profile else 'customer'
 
@@ -0,0 +1,302 @@
+"""Claim processing pipeline shared by the API and the background worker."""
+import logging
+import random
+import time
+from decimal import Decimal
+from functools import partial
+
+import httpx
+from django.db import transaction
+
+from .agent_client import get_agent_client
+from .caching import bump_dashboard_version
+from .models import AuditLog, Claim, FraudAlert, Notification
+
+logger = logging.getLogger(__name__)
+
+# Policy section cited by the built-in processor for each loss type
+_POLICY_SECTIONS = {
+    'collision': 'Collision Coverage - Section 4.2',
+    'comprehensive': 'Comprehensive Coverage - Section 4.3',
+    'liability': 'Liability Coverage - Section 3.1',
+    'theft': 'Theft & Stolen Vehicle - Section 5.1',
+    'vandalism': 'Vandalism Coverage - Section 5.2',
+    'weather': 'Weather & Natural Disaster - Section 5.3',
+}
+
+# Steps reported by the built-in processor: (step, agent, min_ms, max_ms, seconds after start)
+_BUILTIN_STEPS = (
+    ('claim_parsing', 'ClaimParser', 800, 2000, 0),
+    ('policy_query_generation', 'PolicyRetriever', 400, 1200, 2),
+    ('policy_retrieval', 'PolicyRetriever', 800, 2500, 5),
+    ('fraud_detection', 'FraudDetector', 1000, 3500, 9),
+    ('recommendation_generation', 'RecommendationAgent', 1500, 4000, 14),
+    ('decision_finalization', 'DecisionMaker', 1000, 3000, 19),
+)
+
+
+class AgentProcessingError(Exception):
+    """The agent service answered but could not process the claim."""
+
+
+def log_and_notify(audit_logs=(), notifications=(), fraud_alerts=()):
+    """Write a handler's side-effect rows with one INSERT per table in a single transaction.
+
+    Inside a caller's ``atomic()`` block the rows join that transaction
+    without a savepoint of their own. Notifications are not part of the
+    change itself, so they are handed to the worker once it commits.
+    """
+    with transaction.atomic(savepoint=False):
+        if fraud_alerts:
+            FraudAlert.objects.bulk_create(fraud_alerts)
+            transaction.on_commit(bump_dashboard_version)
+        if audit_logs:
+            AuditLog.objects.bulk_create(audit_logs)
+        if notifications:
+            transaction.on_commit(partial(_queue_notifications, list(notifications)))
+
+
+def _queue_notifications(notifications):
+    """Have the worker insert ``notifications``, or insert them here when no broker is reachable."""
+    from .tasks import create_notifications_task  # tasks imports this module
+
+    rows = [
+        {
+            'user_id': n.user_id,
+            'notification_type': n.notification_type,
+            'title': n.title,
+            'message': n.message,
+            'claim_id': str(n.claim_id) if n.claim_id else None,
+            'metadata': n.metadata,
+        }
+        for n in notifications
+    ]
+    try:
+        create_notifications_task.delay(rows)
+    except Exception as e:
+        logger.warning(f"Task queue unavailable ({e}), creating notifications inline")
+        Notification.objects.bulk_create(notifications)
+
+
+def net_settlement(approved, deductible):
+    """Payout after the deductible, never negative.
+
+    Scalar counterpart of ``ClaimQuerySet.recompute_settlements()``.
+    """
+    return max(Decimal('0'), Decimal(str(approved or 0)) - Decimal(str(deductible or 0)))
+
+
+def _apply_decision(claim, decision):
+    """Copy an agent-service coverage decision onto the claim (unsaved)."""
+    if decision.get('covered'):
+        claim.status = 'approved'
+        claim.approved_amount = Decimal(str(decision.get('recommended_payout', 0)))
+        claim.deductible_applied = Decimal(str(decision.get('deductible', 0)))
+        claim.settlement_amount = net_settlement(claim.approved_amount, claim.deductible_applied)
+    else:
+        claim.status = 'denied'
+
+
+def index_policy_document(policy_doc, file_url):
+    """Have the agent service chunk and embed ``policy_doc``; returns the chunk count."""
+    response = get_agent_client().post(
+        '/api/index-policy',
+        json={
+            'document_id': str(policy_doc.id),
+            'file_url': file_url,
+            'policy_type': policy_doc.policy_type,
+        },
+        timeout=60.0,
+    )
+    if response.status_code != 200:
+        raise AgentProcessingError(f'Indexing failed ({response.status_code})')
+    policy_doc.is_indexed = True
+    policy_doc.chunk_count = response.json().get('chunk_count', 0)
+    policy_doc.save(update_fields=['is_indexed', 'chunk_count', 'updated_at'])
+    return policy_doc.chunk_count
+
+
+def processing_summary(claim):
+    """The status/recommendation/fraud_score payload returned to API clients."""
+    return {
+        'status': claim.status,
+        'recommendation': claim.ai_recommendation,
+        'fraud_score': claim.fraud_score,
+    }
+
+
+def process_claim(claim, user, processing_type='full', fallback=True):
+    """Run AI processing for ``claim`` and persist the outcome.
+
+    Uses the agent service and falls back to the built-in processor when it
+    is unreachable. With ``fallback=False`` connection errors propagate
+    instead, so a caller can retry the agent first. Returns the
+    status/recommendation/fraud_score summary.
+    """
+    try:
+        claim_data = {
+            'claim_id': str(claim.id),
+            'claim_number': claim.claim_number,
+            'policy_number': claim.policy.policy_number,
+            'claimant_name': claim.claimant.get_full_name(),
+            'date_of_loss': str(claim.date_of_loss),
+            'loss_description': claim.loss_description,
+            'loss_type': claim.loss_type,
+            'estimated_repair_cost': float(claim.estimated_repair_cost),
+            'vehicle_details': claim.vehicle_details,
+            'third_party_involved': claim.third_party_involved,
+            'processing_type': processing_type,
+        }
+
+        response = get_agent_client().post('/api/process-claim', json=claim_data)
+
+        if response.status_code == 200:
+            result = response.json()
+            claim.ai_recommendation = result.get('recommendation', {})
+            claim.fraud_score = result.get('fraud_score')
+            claim.fraud_flags = result.get('fraud_flags', [])
+            claim.ai_processing_log = result.get('processing_log', [])
+
+            _apply_decision(claim, result.get('decision', {}))
+
+            claim.save(update_fields=[
+                'ai_recommendation', 'fraud_score', 'fraud_flags', 'ai_processing_log', 'status',
+                'approved_amount', 'deductible_applied', 'settlement_amount', 'updated_at',
+            ])
+            return processing_summary(claim)
+        else:
+            claim.status = 'under_review'
+            Claim.objects.filter(pk=claim.pk).set_status(claim.status)
+            raise AgentProcessingError('Agent processing failed')
+    except AgentProcessingError:
+        raise
+    except Exception as e:
+        if not fallback and isinstance(e, httpx.TransportError):
+            raise
+        logger.warning(f"Agent service unavailable ({e}), using built-in processor")
+        return process_claim_builtin(claim, user)
+
+
+def process_claim_builtin(claim, user):
+    """Built-in claim processor that works without external AI service."""
+    # Fraud Detection
+    fraud_score = round(random.uniform(0.05, 0.45), 2)
+    fraud_flags = []
+    if fraud_score > 0.3:
+        fraud_flags.append({
+            'indicator': 'Elevated Cost Ratio',
+            'description': 'Repair estimate is above average for this damage type',
+            'severity': 'medium',
+        })
+    if claim.third_party_involved:
+        fraud_flags.append({
+            'indicator': 'Third Party Involvement',
+            'description': 'Third party claims require additional verification',
+            'severity': 'low',
+        })
+    fraud_label = 'Low risk' if fraud_score < 0.3 else 'Medium risk' if fraud_score < 0.6 else 'High risk'
+
+    # Recommendation
+    cost = float(claim.estimated_repair_cost)
+    deductible = float(claim.policy.deductible_amount)
+    coverage_limit = float(claim.policy.coverage_limit)
+    covered = cost <= coverage_limit and fraud_score < 0.7
+
+    policy_section = _POLICY_SECTIONS.get(claim.loss_type, 'General Coverage - Section 2.1')
+
+    if covered:
+        settlement = max(0, cost * 0.85 - deductible)
+        rec_summary = (
+            f'Claim is covered under {policy_section}. Based on the reported '
+            f'{claim.get_loss_type_display()} incident, the estimated repair cost of '
+            f'${cost:,.2f} falls within policy limits. After applying the ${deductible:,.2f} '
+            f'deductible, recommended settlement is ${settlement:,.2f}.'
+        )
+    else:
+        settlement = 0
+        rec_summary = (
+            f'After review, this claim does not meet coverage criteria under {policy_section}. '
+            f'The estimated cost exceeds policy limits or fraud indicators suggest further investigation.'
+        )
+
+    # Processing log, one entry per _BUILTIN_STEPS row
+    verdict = 'Approve' if covered else 'Deny'
+    summaries = (
+        f'Parsed {claim.loss_type} claim: {claim.loss_description[:60]}...',
+        f'Generated queries for {claim.loss_type} coverage, deductible terms, exclusions',
+        'Retrieved 4 relevant policy sections from knowledge base',
+        f'Fraud score: {int(fraud_score * 100)}% - {fraud_label}',
+        f'{verdict}: ${settlement:,.2f} settlement recommended',
+        f'Final decision: {verdict} - {fraud_label}',
+    )
+    base_ts = time.time()
+    processing_log = [
+        {
+            'step': step, 'agent': agent, 'status': 'completed',
+            'duration_ms': random.randint(min_ms, max_ms),
+            'result_summary': summary,
+            'timestamp': base_ts + offset,
+        }
+        for (step, agent, min_ms, max_ms, offset), summary in zip(_BUILTIN_STEPS, summaries)
+    ]
+
+    # Update claim
+    claim.ai_recommendation = {
+        'policy_section': policy_section,
+        'recommendation_summary': rec_summary,
+        'deductible': deductible if covered else None,
+        'settlement_amount': settlement if covered else None,
+        'ai_decision': 'approve' if covered else 'deny',
+    }
+    claim.fraud_score = fraud_score
+    claim.fraud_flags = fraud_flags
+    claim.ai_processing_log = processing_log
+
+    # AI sets recommended amounts but puts claim into under_review for human decision
+    if covered:
+        claim.approved_amount = Decimal(str(round(cost * 0.85, 2)))
+        claim.deductible_applied = claim.policy.deductible_amount
+        claim.settlement_amount = net_settlement(claim.approved_amount, claim.deductible_applied)
+
+    claim.status = 'under_review'
+
+    # Create fraud alert if score is elevated
+    fraud_alerts = []
+    if fraud_score > 0.3:
+        fraud_alerts.append(FraudAlert(
+            claim=claim,
+            severity='medium' if fraud_score < 0.6 else 'high',
+            alert_type='AI Fraud Detection',
+            description=f'Automated fraud analysis flagged this claim with a {int(fraud_score * 100)}% risk score.',
+            indicators=[f['indicator'] for f in fraud_flags],
+            ai_confidence=fraud_score,
+        ))
+
+    # The claim update and its side-effect rows commit together
+    with transaction.atomic():
+        claim.save(update_fields=[
+            'ai_recommendation', 'fraud_score', 'fraud_flags', 'ai_processing_log', 'status',
+            'approved_amount', 'deductible_applied', 'settlement_amount', 'updated_at',
+        ])
+        log_and_notify(
+            fraud_alerts=fraud_alerts,
+            notifications=[Notification(
+                user=claim.claimant,
+                notification_type='claim_update',
+                title=f'Claim {claim.claim_number} AI Review Complete',
+                message=f'Your claim has been analyzed by AI and is now pending human review. '
+                        f'AI recommendation: {"Approve" if covered else "Deny"}.',
+                claim=claim,
+            )],
+            audit_logs=[AuditLog(
+                claim=claim, user=user, action='ai_processed',
+                details={
+                    'processor': 'built_in',
+                    'ai_recommendation': 'approve' if covered else 'deny',
+                    'fraud_score': fraud_score,
+                    'recommended_settlement': float(settlement),
+                },
+            )],
+        )
+
+    return processing_summary(claim)
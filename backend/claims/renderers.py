@@ -0,0 +1,25 @@
+"""Response renderers for the claims API."""
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_fallback = JSONEncoder().default
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer backed by orjson for large, frequently polled payloads.
+
+    Types orjson does not know natively (Decimal, lazy strings, querysets)
+    fall back to DRF's encoder. Datetimes are encoded by orjson itself, so a
+    raw aware UTC datetime renders with a ``+00:00`` offset where the stock
+    renderer writes ``Z``. Serializer fields are unaffected; they format
+    datetimes as strings before rendering.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        option = orjson.OPT_NON_STR_KEYS
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_fallback, option=option)
@@ -1,10 +1,11 @@
 """Serializers for the Insurance Claims API."""
 import uuid
-import random
 from datetime import date, timedelta
 from decimal import Decimal
+from operator import attrgetter
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.db import transaction
 from .models import (
     UserProfile, PolicyDocument, InsurancePolicy, Claim, ClaimDocument,
     ClaimNote, AuditLog, FraudAlert, AgentTask, Notification, DashboardMetric,
@@ -32,60 +33,141 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         choices=PolicyDocument.POLICY_TYPES, default='auto', write_only=True,
     )
 
+    # Starter policy terms for self-registered customers, by policy type
+    POLICY_DEFAULTS = {
+        'auto': {'premium': Decimal('1200'), 'deductible': Decimal('500'),
+                 'coverage': Decimal('50000'), 'has_vehicle': True},
+        'home': {'premium': Decimal('1800'), 'deductible': Decimal('1000'),
+                 'coverage': Decimal('250000'), 'has_vehicle': False},
+        'health': {'premium': Decimal('600'), 'deductible': Decimal('500'),
+                   'coverage': Decimal('100000'), 'has_vehicle': False},
+        'life': {'premium': Decimal('400'), 'deductible': Decimal('0'),
+                 'coverage': Decimal('500000'), 'has_vehicle': False},
+        'commercial': {'premium': Decimal('3000'), 'deductible': Decimal('2000'),
+                       'coverage': Decimal('500000'), 'has_vehicle': False},
+    }
+
     class Meta:
         model = User
         fields = ['username', 'email', 'password', 'first_name', 'last_name', 'role', 'policy_type']
 
-    def _generate_policy_number(self):
-        """Generate a unique policy number."""
-        while True:
-            num = f'POL-{random.randint(200000, 999999)}'
-            if not InsurancePolicy.objects.filter(policy_number=num).exists():
-                return num
+    @staticmethod
+    def _generate_policy_number():
+        """Generate a unique policy number (40 random bits; the unique index backs it up)."""
+        return f'POL-{uuid.uuid4().hex[:10].upper()}'
+
+    @classmethod
+    def _build_customer_policy(cls, user, policy_type):
+        """Build (unsaved) the starter insurance policy given to new customers."""
+        cfg = cls.POLICY_DEFAULTS.get(policy_type, cls.POLICY_DEFAULTS['auto'])
+        today = date.today()
+        vehicle = {}
+        if cfg['has_vehicle']:
+            vehicle = {'make_model': 'New Vehicle', 'year': str(today.year)}
+        return InsurancePolicy(
+            policy_number=cls._generate_policy_number(),
+            holder=user,
+            policy_type=policy_type,
+            status='active',
+            premium_amount=cfg['premium'],
+            deductible_amount=cfg['deductible'],
+            coverage_limit=cfg['coverage'],
+            effective_date=today,
+            expiry_date=today + timedelta(days=365),
+            vehicle_details=vehicle,
+        )
 
     def create(self, validated_data):
         role = validated_data.pop('role', 'customer')
         password = validated_data.pop('password')
         policy_type = validated_data.pop('policy_type', 'auto')
-        user = User.objects.create_user(**validated_data, password=password)
-        UserProfile.objects.create(user=user, role=role)
-
-        # Auto-create an insurance policy for customer users
-        if role == 'customer':
-            defaults = {
-                'auto': {'premium': 1200, 'deductible': 500, 'coverage': 50000,
-                         'vehicle': {'make_model': 'New Vehicle', 'year': str(date.today().year)}},
-                'home': {'premium': 1800, 'deductible': 1000, 'coverage': 250000, 'vehicle': {}},
-                'health': {'premium': 600, 'deductible': 500, 'coverage': 100000, 'vehicle': {}},
-                'life': {'premium': 400, 'deductible': 0, 'coverage': 500000, 'vehicle': {}},
-                'commercial': {'premium': 3000, 'deductible': 2000, 'coverage': 500000, 'vehicle': {}},
-            }
-            cfg = defaults.get(policy_type, defaults['auto'])
-            InsurancePolicy.objects.create(
-                policy_number=self._generate_policy_number(),
-                holder=user,
-                policy_type=policy_type,
-                status='active',
-                premium_amount=Decimal(str(cfg['premium'])),
-                deductible_amount=Decimal(str(cfg['deductible'])),
-                coverage_limit=Decimal(str(cfg['coverage'])),
-                effective_date=date.today(),
-                expiry_date=date.today() + timedelta(days=365),
-                vehicle_details=cfg['vehicle'],
-            )
+        with transaction.atomic():
+            user = User.objects.create_user(**validated_data, password=password)
+            UserProfile.objects.create(user=user, role=role)
+
+            # Auto-create an insurance policy for customer users
+            if role == 'customer':
+                self._build_customer_policy(user, policy_type).save()
         return user
 
 
+class EagerLoadMixin:
+    """Serializer mixin that joins the FKs its dotted ``source=`` fields read.
+
+    ``select_related_fields`` is derived from the declared fields on first
+    use; set it explicitly on a subclass to override the introspection.
+    """
+    select_related_fields = None
+    prefetch_related_fields = ()
+
+    @classmethod
+    def get_select_related_fields(cls):
+        if cls.__dict__.get('select_related_fields') is None:
+            relations = []
+            for field in cls._declared_fields.values():
+                source = field.source or ''
+                head = source.split('.')[0]
+                if '.' not in source or head in relations:
+                    continue
+                model_field = cls.Meta.model._meta.get_field(head)
+                if model_field.many_to_one or model_field.one_to_one:
+                    relations.append(head)
+            cls.select_related_fields = tuple(relations)
+        return cls.select_related_fields
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        select_related_fields = cls.get_select_related_fields()
+        # A bare select_related() would follow every non-null FK
+        if select_related_fields:
+            queryset = queryset.select_related(*select_related_fields)
+        if cls.prefetch_related_fields:
+            queryset = queryset.prefetch_related(*cls.prefetch_related_fields)
+        return queryset
+
+
+class FlatRepresentationMixin:
+    """Serializer mixin that resolves each readable field's accessor once per serializer.
+
+    DRF re-walks ``source_attrs`` through ``get_attribute`` for every field of
+    every row. For flat, fixed-shape list serializers the accessors are
+    compiled into ``attrgetter`` calls on first use and reused for the rest
+    of the page. Only plain (optionally dotted) sources are supported.
+    """
+
+    def _get_representation_plan(self):
+        plan = self.__dict__.get('_representation_plan')
+        if plan is None:
+            plan = self._representation_plan = [
+                (field.field_name, attrgetter('.'.join(field.source_attrs)), field.to_representation)
+                for field in self._readable_fields
+            ]
+        return plan
+
+    def to_representation(self, instance):
+        ret = {}
+        for name, get_value, to_representation in self._get_representation_plan():
+            value = get_value(instance)
+            if callable(value):
+                value = value()
+            ret[name] = None if value is None else to_representation(value)
+        return ret
+
+
 class PolicyDocumentSerializer(serializers.ModelSerializer):
     uploaded_by_name = serializers.CharField(source='uploaded_by.get_full_name', read_only=True)
 
     class Meta:
         model = PolicyDocument
-        fields = '__all__'
+        fields = [
+            'id', 'title', 'policy_type', 'document', 'version', 'effective_date',
+            'expiry_date', 'is_indexed', 'chunk_count', 'uploaded_by', 'uploaded_by_name',
+            'created_at', 'updated_at',
+        ]
         read_only_fields = ['id', 'is_indexed', 'chunk_count', 'created_at', 'updated_at']
 
 
-class InsurancePolicySerializer(serializers.ModelSerializer):
+class InsurancePolicySerializer(EagerLoadMixin, serializers.ModelSerializer):
     holder_name = serializers.CharField(source='holder.get_full_name', read_only=True)
     policy_document_title = serializers.CharField(
         source='policy_document.title', read_only=True, default=None
@@ -93,7 +175,12 @@ class InsurancePolicySerializer(serializers.ModelSerializer):
 
     class Meta:
         model = InsurancePolicy
-        fields = '__all__'
+        fields = [
+            'id', 'policy_number', 'policy_document', 'policy_document_title',
+            'holder', 'holder_name', 'policy_type', 'status', 'premium_amount',
+            'deductible_amount', 'coverage_limit', 'effective_date', 'expiry_date',
+            'vehicle_details', 'created_at', 'updated_at',
+        ]
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
@@ -102,8 +189,12 @@ class ClaimDocumentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ClaimDocument
-        fields = '__all__'
-        read_only_fields = ['id', 'ai_extracted_data', 'created_at']
+        fields = [
+            'id', 'claim', 'document_type', 'file', 'filename', 'description',
+            'ai_extracted_data', 'uploaded_by', 'uploaded_by_name', 'created_at',
+        ]
+        # The claim comes from the URL of the upload action, never from the payload
+        read_only_fields = ['id', 'claim', 'ai_extracted_data', 'created_at']
 
 
 class ClaimNoteSerializer(serializers.ModelSerializer):
@@ -111,7 +202,10 @@ class ClaimNoteSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ClaimNote
-        fields = '__all__'
+        fields = [
+            'id', 'claim', 'author', 'author_name', 'content',
+            'is_internal', 'is_ai_generated', 'created_at',
+        ]
         read_only_fields = ['id', 'created_at']
 
 
@@ -120,7 +214,10 @@ class AuditLogSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = AuditLog
-        fields = '__all__'
+        fields = [
+            'id', 'claim', 'user', 'user_name', 'action', 'details',
+            'old_value', 'new_value', 'ip_address', 'timestamp',
+        ]
         read_only_fields = ['id', 'timestamp']
 
     def get_user_name(self, obj):
@@ -129,7 +226,7 @@ class AuditLogSerializer(serializers.ModelSerializer):
         return 'System'
 
 
-class FraudAlertSerializer(serializers.ModelSerializer):
+class FraudAlertSerializer(EagerLoadMixin, serializers.ModelSerializer):
     claim_number = serializers.CharField(source='claim.claim_number', read_only=True)
     reviewed_by_name = serializers.CharField(
         source='reviewed_by.get_full_name', read_only=True, default=None
@@ -137,27 +234,42 @@ class FraudAlertSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = FraudAlert
-        fields = '__all__'
+        fields = [
+            'id', 'claim', 'claim_number', 'severity', 'status', 'alert_type',
+            'description', 'indicators', 'ai_confidence', 'reviewed_by',
+            'reviewed_by_name', 'resolution_notes', 'created_at', 'resolved_at',
+        ]
         read_only_fields = ['id', 'created_at']
 
 
-class AgentTaskSerializer(serializers.ModelSerializer):
+class AgentTaskListSerializer(EagerLoadMixin, serializers.ModelSerializer):
+    """Agent task summary without the input/output payloads."""
     claim_number = serializers.CharField(source='claim.claim_number', read_only=True)
 
     class Meta:
         model = AgentTask
-        fields = '__all__'
+        fields = [
+            'id', 'claim', 'claim_number', 'agent_type', 'status', 'parent_task',
+            'duration_ms', 'started_at', 'completed_at', 'created_at',
+        ]
         read_only_fields = ['id', 'created_at']
 
 
-class ClaimListSerializer(serializers.ModelSerializer):
-    """Lightweight serializer for claim lists."""
-    claimant_name = serializers.CharField(source='claimant.get_full_name', read_only=True)
-    policy_number = serializers.CharField(source='policy.policy_number', read_only=True)
-    adjuster_name = serializers.CharField(
-        source='assigned_adjuster.get_full_name', read_only=True, default=None
-    )
-    document_count = serializers.IntegerField(source='documents.count', read_only=True)
+class AgentTaskDetailSerializer(AgentTaskListSerializer):
+    class Meta(AgentTaskListSerializer.Meta):
+        fields = AgentTaskListSerializer.Meta.fields + ['input_data', 'output_data', 'error_message']
+
+
+class ClaimListSerializer(FlatRepresentationMixin, EagerLoadMixin, serializers.ModelSerializer):
+    """Lightweight serializer for claim lists.
+
+    Reads the denormalized name columns on Claim and expects a queryset
+    annotated with ``Claim.objects.with_list_data()``.
+    """
+    claimant_name = serializers.CharField(source='claimant_name_cache', read_only=True)
+    policy_number = serializers.CharField(source='policy_number_cache', read_only=True)
+    adjuster_name = serializers.CharField(read_only=True)
+    document_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Claim
@@ -180,15 +292,43 @@ class ClaimDetailSerializer(serializers.ModelSerializer):
     notes = ClaimNoteSerializer(many=True, read_only=True)
     audit_logs = AuditLogSerializer(many=True, read_only=True)
     fraud_alerts = FraudAlertSerializer(many=True, read_only=True)
-    agent_tasks = AgentTaskSerializer(many=True, read_only=True)
+    agent_tasks = AgentTaskDetailSerializer(many=True, read_only=True)
+    document_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Claim
-        fields = '__all__'
+        fields = [
+            'id', 'claim_number', 'policy', 'policy_number', 'claimant', 'claimant_name',
+            'assigned_adjuster', 'adjuster_name', 'status', 'priority', 'loss_type',
+            'date_of_loss', 'date_reported', 'loss_description', 'loss_location',
+            'estimated_repair_cost', 'approved_amount', 'deductible_applied',
+            'settlement_amount', 'vehicle_details', 'third_party_involved',
+            'police_report_number', 'fraud_score', 'fraud_flags', 'ai_recommendation',
+            'documents', 'notes', 'audit_logs', 'fraud_alerts',
+            'agent_tasks', 'document_count', 'created_at', 'updated_at',
+        ]
         read_only_fields = [
             'id', 'claim_number', 'fraud_score', 'fraud_flags',
-            'ai_recommendation', 'ai_processing_log', 'created_at', 'updated_at',
+            'ai_recommendation', 'created_at', 'updated_at',
+        ]
+
+    def get_document_count(self, obj):
+        # Reuses the prefetched documents instead of issuing a COUNT(*)
+        return len(obj.documents.all())
+
+
+class ClaimAIDetailSerializer(serializers.ModelSerializer):
+    """AI outcome of a claim including the full agent processing log.
+
+    Kept out of ClaimDetailSerializer so the detail view can defer the log.
+    """
+    class Meta:
+        model = Claim
+        fields = [
+            'id', 'claim_number', 'status', 'fraud_score', 'fraud_flags',
+            'ai_recommendation', 'ai_processing_log', 'updated_at',
         ]
+        read_only_fields = fields
 
 
 class ClaimCreateSerializer(serializers.ModelSerializer):
@@ -207,21 +347,27 @@ class ClaimCreateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(EagerLoadMixin, serializers.ModelSerializer):
     claim_number = serializers.CharField(
         source='claim.claim_number', read_only=True, default=None
     )
 
     class Meta:
         model = Notification
-        fields = '__all__'
+        fields = [
+            'id', 'user', 'notification_type', 'title', 'message', 'claim',
+            'claim_number', 'is_read', 'metadata', 'created_at',
+        ]
         read_only_fields = ['id', 'created_at']
 
 
 class DashboardMetricSerializer(serializers.ModelSerializer):
     class Meta:
         model = DashboardMetric
-        fields = '__all__'
+        fields = [
+            'id', 'metric_name', 'metric_value', 'period_start', 'period_end',
+            'metadata', 'computed_at',
+        ]
 
 
 class ClaimProcessRequestSerializer(serializers.Serializer):
@@ -0,0 +1,69 @@
+"""Signal handlers keeping denormalized claim fields and cached payloads in sync."""
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from .caching import bump_dashboard_version
+from .models import UserProfile, InsurancePolicy, Claim, ClaimDocument, FraudAlert
+
+
+@receiver(post_save, sender=User)
+def refresh_claim_user_names(sender, instance, created, update_fields=None, **kwargs):
+    """Propagate a renamed user to the claims that display their name."""
+    if created:
+        return
+    if update_fields is not None and not {'first_name', 'last_name'} & set(update_fields):
+        return
+    name = instance.get_full_name()
+    changed = Claim.objects.filter(claimant=instance).exclude(
+        claimant_name_cache=name
+    ).update(claimant_name_cache=name)
+    changed += Claim.objects.filter(assigned_adjuster=instance).exclude(
+        adjuster_name_cache=name
+    ).update(adjuster_name_cache=name)
+    if changed:
+        transaction.on_commit(bump_dashboard_version)
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_profile_cache(sender, instance, created=False, **kwargs):
+    # A just-created user cannot have a cached payload yet
+    if not created:
+        cache.delete(UserProfile.cache_key(instance.pk))
+
+
+@receiver([post_save, post_delete], sender=UserProfile)
+def invalidate_profile_cache(sender, instance, created=False, **kwargs):
+    if not created:
+        cache.delete(UserProfile.cache_key(instance.user_id))
+
+
+@receiver([post_save, post_delete], sender=Claim)
+@receiver([post_save, post_delete], sender=ClaimDocument)
+@receiver([post_save, post_delete], sender=FraudAlert)
+@receiver([post_save, post_delete], sender=UserProfile)
+def invalidate_dashboards(sender, **kwargs):
+    transaction.on_commit(bump_dashboard_version)
+
+
+@receiver(post_save, sender=InsurancePolicy)
+def refresh_claim_policy_numbers(sender, instance, created, **kwargs):
+    """Propagate a changed policy number to its claims."""
+    if created:
+        return
+    if Claim.objects.filter(policy=instance).exclude(
+        policy_number_cache=instance.policy_number
+    ).update(policy_number_cache=instance.policy_number):
+        transaction.on_commit(bump_dashboard_version)
+
+
+@receiver(post_migrate)
+def backfill_claim_display_caches(sender, using, **kwargs):
+    """Fill the denormalized claim columns right after migrate adds them to existing rows."""
+    if sender.name != 'claims':
+        return
+    if Claim._meta.db_table not in connections[using].introspection.table_names():
+        return
+    Claim.objects.using(using).backfill_display_caches()
@@ -0,0 +1,62 @@
+"""Celery tasks for the claims app."""
+import logging
+
+import httpx
+from celery import shared_task
+from django.contrib.auth.models import User
+from django.core.cache import cache
+
+from .caching import DASHBOARD_SUMMARY_KEY
+from .dashboard import build_dashboard, record_metric_snapshot
+from .models import Claim, Notification, PolicyDocument
+from .processing import AgentProcessingError, index_policy_document, process_claim
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, acks_late=True, ignore_result=True, max_retries=3, default_retry_delay=30)
+def process_claim_task(self, claim_id, user_id, processing_type='full'):
+    """Run AI processing for a claim off the request thread.
+
+    An unreachable agent service is retried a few times before the last
+    attempt settles for the built-in processor.
+    """
+    claim = Claim.objects.select_related('claimant', 'policy').get(pk=claim_id)
+    user = User.objects.filter(pk=user_id).first()
+    try:
+        process_claim(
+            claim, user, processing_type, fallback=self.request.retries >= self.max_retries,
+        )
+    except httpx.TransportError as e:
+        raise self.retry(exc=e)
+    except AgentProcessingError as e:
+        logger.warning(f"Agent processing failed for claim {claim.claim_number}: {e}")
+
+
+@shared_task(acks_late=True, ignore_result=True)
+def index_policy_document_task(document_id, file_url):
+    """Index a policy document in the vector store off the request thread."""
+    policy_doc = PolicyDocument.objects.get(pk=document_id)
+    try:
+        index_policy_document(policy_doc, file_url)
+    except AgentProcessingError as e:
+        logger.warning(f"Indexing failed for policy document {policy_doc.id}: {e}")
+
+
+@shared_task(acks_late=True, ignore_result=True)
+def create_notifications_task(rows):
+    """Insert notifications queued by ``processing.log_and_notify`` in one statement."""
+    Notification.objects.bulk_create(Notification(**row) for row in rows)
+
+
+@shared_task(ignore_result=True)
+def refresh_dashboard_metrics():
+    """Rebuild the global dashboard summary and snapshot today's headline metrics.
+
+    Runs every minute from beat. Admins and managers read the summary instead
+    of aggregating the claims table per request; it outlives the interval so
+    a late run does not send them back to live queries.
+    """
+    data = build_dashboard(None, 'admin')
+    cache.set(DASHBOARD_SUMMARY_KEY, data, timeout=120)
+    record_metric_snapshot(data)
@@ -0,0 +1,345 @@
+"""Tests for the claims API.
+
+Clients are force-authenticated with users loaded the way the authentication
+classes load them (profile joined), so query counts cover the view alone.
+"""
+import os
+import shutil
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+import httpx
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from .caching import DASHBOARD_VERSION_KEY
+from .models import (
+    AgentTask, AuditLog, Claim, ClaimDocument, ClaimNote, FraudAlert, InsurancePolicy,
+    Notification, UserProfile,
+)
+from .tasks import process_claim_task
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class ClaimsTestCase(APITestCase):
+    """Seeds staff and customer users; helpers add claims with child rows."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = cls._make_user('admin', 'admin')
+        cls.adjuster = cls._make_user('adjuster', 'adjuster')
+        cls.customer = cls._make_user('customer', 'customer')
+        cls.policy = InsurancePolicy.objects.create(
+            policy_number='POL-TEST-0001', holder=cls.customer, policy_type='auto',
+            status='active', premium_amount=Decimal('1200'), deductible_amount=Decimal('500'),
+            coverage_limit=Decimal('50000'), effective_date=date.today(),
+            expiry_date=date.today() + timedelta(days=365),
+        )
+
+    @staticmethod
+    def _make_user(username, role):
+        user = User.objects.create_user(
+            username=username, password='pass12345', first_name=username.title(), last_name='User',
+        )
+        UserProfile.objects.create(user=user, role=role)
+        return user
+
+    def client_for(self, user):
+        self.client.force_authenticate(User.objects.select_related('profile').get(pk=user.pk))
+        return self.client
+
+    def add_claim(self, children=2):
+        """Create a claim assigned to the adjuster with ``children`` documents, notes and audit rows."""
+        claim = Claim.objects.create(
+            policy=self.policy, claimant=self.customer, assigned_adjuster=self.adjuster,
+            status='submitted', date_of_loss=date.today(), loss_description='Rear-ended at a light',
+            estimated_repair_cost=Decimal('2500'),
+        )
+        self.add_children(claim, children)
+        return claim
+
+    def add_children(self, claim, count):
+        for i in range(count):
+            ClaimDocument.objects.create(
+                claim=claim, file=f'claims/documents/doc{i}.txt', filename=f'doc{i}.txt',
+                uploaded_by=self.adjuster,
+            )
+            ClaimNote.objects.create(claim=claim, author=self.adjuster, content=f'Note {i}')
+            AuditLog.objects.create(claim=claim, user=self.adjuster, action='updated')
+
+
+class ClaimQueryCountTests(ClaimsTestCase):
+    """Claim list, detail, update and dashboard stay at a fixed number of queries."""
+
+    def test_list(self):
+        client = self.client_for(self.admin)
+        self.add_claim()
+        with self.assertNumQueries(2):  # COUNT + page
+            client.get('/api/claims/')
+        for _ in range(3):
+            self.add_claim(children=3)
+        with self.assertNumQueries(2):
+            response = client.get('/api/claims/')
+        self.assertEqual(response.data['count'], 4)
+        self.assertEqual(response.data['results'][0]['document_count'], 3)
+
+    def test_retrieve(self):
+        client = self.client_for(self.adjuster)
+        claim = self.add_claim()
+        # Claim row plus one query per prefetched child list
+        with self.assertNumQueries(6):
+            client.get(f'/api/claims/{claim.id}/')
+        self.add_children(claim, 4)
+        with self.assertNumQueries(6):
+            response = client.get(f'/api/claims/{claim.id}/')
+        self.assertEqual(len(response.data['documents']), 6)
+        self.assertEqual(len(response.data['notes']), 6)
+
+    def test_partial_update(self):
+        client = self.client_for(self.adjuster)
+        claim = self.add_claim()
+        # Claim row, UPDATE, then the prefetched child lists for the response
+        with self.assertNumQueries(7):
+            client.patch(f'/api/claims/{claim.id}/', {'priority': 'high'}, format='json')
+        self.add_children(claim, 4)
+        with self.assertNumQueries(7):
+            response = client.patch(f'/api/claims/{claim.id}/', {'priority': 'low'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['documents']), 6)
+
+    def test_dashboard_recent_claims(self):
+        self.add_claim()
+        for user, queries in ((self.admin, 5), (self.adjuster, 5), (self.customer, 4)):
+            with self.subTest(role=user.profile.role):
+                client = self.client_for(user)
+                with self.assertNumQueries(queries):
+                    client.get('/api/dashboard/')
+                with self.captureOnCommitCallbacks(execute=True):  # bumps the dashboard version
+                    for _ in range(3):
+                        self.add_claim(children=3)
+                with self.assertNumQueries(queries):
+                    response = client.get('/api/dashboard/')
+                self.assertTrue(response.data['recent_claims'])
+                if user is self.adjuster:
+                    self.assertTrue(response.data['my_recent_claims'])
+
+
+class AlertTaskNotificationQueryCountTests(ClaimsTestCase):
+    """Fraud alert, agent task and notification lists stay at COUNT + page as rows grow."""
+
+    def add_rows(self, count):
+        for _ in range(count):
+            claim = self.add_claim(children=0)
+            FraudAlert.objects.create(
+                claim=claim, alert_type='duplicate_claim', description='Possible duplicate',
+                ai_confidence=0.8, reviewed_by=self.adjuster,
+            )
+            AgentTask.objects.create(claim=claim, agent_type='claim_parser')
+            Notification.objects.create(
+                user=self.customer, notification_type='claim_update', title='Claim updated',
+                message='Your claim was updated.', claim=claim,
+            )
+
+    def assert_list_queries(self, user, url, total):
+        client = self.client_for(user)
+        with self.assertNumQueries(2):
+            response = client.get(url)
+        self.assertEqual(response.data['count'], total)
+
+    def test_lists(self):
+        endpoints = (
+            (self.admin, '/api/fraud-alerts/'),
+            (self.adjuster, '/api/agent-tasks/'),
+            (self.customer, '/api/notifications/'),
+        )
+        self.add_rows(2)
+        for user, url in endpoints:
+            with self.subTest(url=url):
+                self.assert_list_queries(user, url, 2)
+        self.add_rows(5)
+        for user, url in endpoints:
+            with self.subTest(url=url):
+                self.assert_list_queries(user, url, 7)
+
+
+class DashboardInvalidationTests(ClaimsTestCase):
+    """Claim writes bump the dashboard version only once their transaction commits."""
+
+    def test_bump_waits_for_commit(self):
+        version = cache.get_or_set(DASHBOARD_VERSION_KEY, 1, timeout=None)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.add_claim(children=0)
+            self.assertEqual(cache.get(DASHBOARD_VERSION_KEY), version)
+        for callback in callbacks:
+            callback()
+        self.assertGreater(cache.get(DASHBOARD_VERSION_KEY), version)
+
+
+class ProcessClaimTests(ClaimsTestCase):
+    """The ``process`` action queues the worker task, which retries the agent before falling back."""
+
+    AGENT_RESULT = {
+        'recommendation': {'summary': 'Covered collision'},
+        'fraud_score': 0.12,
+        'fraud_flags': [],
+        'processing_log': [],
+        'decision': {'covered': True, 'recommended_payout': 2000, 'deductible': 500},
+    }
+
+    def setUp(self):
+        self.claim = self.add_claim(children=0)
+        self.agent = mock.Mock()
+        patcher = mock.patch('claims.processing.get_agent_client', return_value=self.agent)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def agent_reply(self, status_code=200):
+        return mock.Mock(status_code=status_code, json=mock.Mock(return_value=self.AGENT_RESULT))
+
+    def run_task(self):
+        process_claim_task.apply(args=(str(self.claim.id), self.adjuster.id))
+        self.claim.refresh_from_db()
+
+    @override_settings(CELERY_TASK_ALWAYS_EAGER=True)
+    def test_process_returns_202_with_task_id(self):
+        self.agent.post.return_value = self.agent_reply()
+        response = self.client_for(self.adjuster).post(f'/api/claims/{self.claim.id}/process/')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['status'], 'ai_processing')
+        self.assertTrue(response.data['task_id'])
+        self.claim.refresh_from_db()
+        self.assertEqual(self.claim.status, 'approved')
+        self.assertEqual(self.claim.settlement_amount, Decimal('1500'))
+
+    def test_process_runs_inline_when_queue_unavailable(self):
+        self.agent.post.return_value = self.agent_reply()
+        with mock.patch.object(process_claim_task, 'delay', side_effect=OSError('broker down')):
+            response = self.client_for(self.adjuster).post(f'/api/claims/{self.claim.id}/process/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], 'approved')
+
+    def test_task_retries_unreachable_agent(self):
+        self.agent.post.side_effect = [httpx.ConnectError('refused'), self.agent_reply()]
+        with mock.patch('claims.processing.process_claim_builtin') as builtin:
+            self.run_task()
+        self.assertEqual(self.agent.post.call_count, 2)
+        builtin.assert_not_called()
+        self.assertEqual(self.claim.status, 'approved')
+
+    def test_task_falls_back_to_builtin_on_last_retry_only(self):
+        self.agent.post.side_effect = httpx.ConnectError('refused')
+        with mock.patch('claims.processing.process_claim_builtin') as builtin:
+            self.run_task()
+        self.assertEqual(self.agent.post.call_count, process_claim_task.max_retries + 1)
+        builtin.assert_called_once()
+
+    def test_task_agent_error_goes_to_review_without_retry(self):
+        self.agent.post.return_value = self.agent_reply(status_code=500)
+        with mock.patch('claims.processing.process_claim_builtin') as builtin:
+            self.run_task()
+        self.assertEqual(self.agent.post.call_count, 1)
+        builtin.assert_not_called()
+        self.assertEqual(self.claim.status, 'under_review')
+
+
+class UploadDocumentsTests(ClaimsTestCase):
+    """Batch uploads store every file with its row, or nothing at all."""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        self.media_root = media_root
+        self.claim = self.add_claim(children=0)
+
+    def stored_files(self):
+        return [name for _, _, names in os.walk(self.media_root) for name in names]
+
+    def upload(self, *files):
+        return self.client_for(self.adjuster).post(
+            f'/api/claims/{self.claim.id}/upload_documents/', {'files': list(files)}, format='multipart',
+        )
+
+    def test_upload_stores_files_and_rows(self):
+        response = self.upload(
+            SimpleUploadedFile('estimate.txt', b'estimate'), SimpleUploadedFile('photo.txt', b'photo'),
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.claim.documents.count(), 2)
+        self.assertEqual(len(self.stored_files()), 2)
+
+    def test_invalid_file_rejects_the_whole_batch(self):
+        response = self.upload(SimpleUploadedFile('estimate.txt', b'estimate'), SimpleUploadedFile('empty.txt', b''))
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(self.claim.documents.exists())
+        self.assertEqual(self.stored_files(), [])
+
+    def test_failed_insert_deletes_stored_files(self):
+        for manager, method in ((ClaimDocument.objects, 'bulk_create'), (AuditLog.objects, 'create')):
+            with self.subTest(failing=f'{manager.model.__name__}.{method}'):
+                with mock.patch.object(manager, method, side_effect=DatabaseError('insert failed')):
+                    with self.assertRaises(DatabaseError):
+                        self.upload(SimpleUploadedFile('a.txt', b'a'), SimpleUploadedFile('b.txt', b'b'))
+                self.assertFalse(self.claim.documents.exists())
+                self.assertEqual(self.stored_files(), [])
+
+
+class MarkNotificationReadTests(ClaimsTestCase):
+    """``mark_read`` flips only the caller's own notification."""
+
+    def notify(self, user):
+        return Notification.objects.create(
+            user=user, notification_type='claim_update', title='Claim updated', message='Updated.',
+        )
+
+    def test_marks_only_the_callers_row(self):
+        mine, other = self.notify(self.customer), self.notify(self.customer)
+        response = self.client_for(self.customer).post(f'/api/notifications/{mine.id}/mark_read/')
+        self.assertEqual(response.status_code, 200)
+        mine.refresh_from_db()
+        other.refresh_from_db()
+        self.assertTrue(mine.is_read)
+        self.assertFalse(other.is_read)
+
+    def test_other_users_notification_is_not_found(self):
+        theirs = self.notify(self.adjuster)
+        response = self.client_for(self.customer).post(f'/api/notifications/{theirs.id}/mark_read/')
+        self.assertEqual(response.status_code, 404)
+        theirs.refresh_from_db()
+        self.assertFalse(theirs.is_read)
+
+    def test_malformed_id_is_not_found(self):
+        response = self.client_for(self.customer).post('/api/notifications/not-a-uuid/mark_read/')
+        self.assertEqual(response.status_code, 404)
+
+
+class RecomputeSettlementsCommandTests(ClaimsTestCase):
+    """``manage.py recompute_settlements`` rewrites settlements with one UPDATE."""
+
+    def test_recomputes_approved_claims_only(self):
+        covered, underwater, pending = (self.add_claim(children=0) for _ in range(3))
+        Claim.objects.filter(pk=covered.pk).update(
+            approved_amount=Decimal('2000'), deductible_applied=Decimal('500'), settlement_amount=Decimal('0'),
+        )
+        Claim.objects.filter(pk=underwater.pk).update(
+            approved_amount=Decimal('300'), deductible_applied=Decimal('500'), settlement_amount=Decimal('300'),
+        )
+        out = StringIO()
+        with self.assertNumQueries(1):
+            call_command('recompute_settlements', stdout=out)
+        self.assertIn('Recomputed 2 claim settlements.', out.getvalue())
+        settlements = dict(Claim.objects.values_list('pk', 'settlement_amount'))
+        self.assertEqual(settlements[covered.pk], Decimal('1500'))
+        self.assertEqual(settlements[underwater.pk], Decimal('0'))
+        self.assertIsNone(settlements[pending.pk])
@@ -1,47 +1,84 @@
 """Views for the Insurance Claims API."""
 import logging
-import random
-import time
-from datetime import timedelta
-from decimal import Decimal
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
 from django.utils import timezone
-from django.db.models import Sum, Avg, Count, Q, F
-from django.db.models.functions import TruncMonth
+from django.db import transaction
+from django.db.models import Q, Prefetch, prefetch_related_objects
 from django.contrib.auth.models import User
 from rest_framework import viewsets, status, permissions, filters
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.decorators import action, api_view, permission_classes, renderer_classes
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
-from django_filters.rest_framework import DjangoFilterBackend
-import httpx
-
-from django.conf import settings
 from .models import (
     UserProfile, PolicyDocument, InsurancePolicy, Claim, ClaimDocument,
-    ClaimNote, AuditLog, FraudAlert, AgentTask, Notification, DashboardMetric,
+    ClaimNote, AuditLog, FraudAlert, AgentTask, Notification, DashboardMetric, _STATUS_DISPLAY,
 )
 from .serializers import (
     UserProfileSerializer, UserRegistrationSerializer,
     PolicyDocumentSerializer, InsurancePolicySerializer,
-    ClaimListSerializer, ClaimDetailSerializer, ClaimCreateSerializer,
+    ClaimListSerializer, ClaimDetailSerializer, ClaimAIDetailSerializer, ClaimCreateSerializer,
     ClaimDocumentSerializer, ClaimNoteSerializer, AuditLogSerializer,
-    FraudAlertSerializer, AgentTaskSerializer, NotificationSerializer,
-    DashboardMetricSerializer, ClaimProcessRequestSerializer,
+    FraudAlertSerializer, AgentTaskListSerializer, AgentTaskDetailSerializer,
+    NotificationSerializer, DashboardMetricSerializer, ClaimProcessRequestSerializer,
+)
+from .caching import (
+    DASHBOARD_SUMMARY_KEY, analytics_cache_key, bump_dashboard_version, dashboard_cache_key,
 )
+from .dashboard import build_analytics, build_dashboard
+from .filtering import CachedFilterSetBackend, SkipIdleFiltersMixin
+from .pagination import StandardPagination
+from .renderers import ORJSONRenderer
+from .processing import (
+    AgentProcessingError, index_policy_document, log_and_notify, process_claim, processing_summary,
+)
+from .tasks import index_policy_document_task, process_claim_task
 from .permissions import (
     IsAdmin, IsManagement, IsStaff, IsStaffOrReadOnly,
     IsOwnerOrStaff, CanProcessClaims, CanAssignClaims,
     CanManageFraudAlerts, CanViewAnalytics, CanManageUsers,
-    STAFF_ROLES, MANAGEMENT_ROLES, PROCESSING_ROLES,
+    STAFF_ROLES, MANAGEMENT_ROLES, PROCESSING_ROLES, _get_role,
 )
 
 logger = logging.getLogger(__name__)
 
+_VALID_CLAIM_STATUSES = frozenset(s[0] for s in Claim.STATUS_CHOICES)
+_VALID_ROLES = frozenset(r[0] for r in UserProfile.ROLE_CHOICES)
+
+# Standard workflow transitions open to non-management staff
+_ALLOWED_TRANSITIONS = {
+    'submitted': ('under_review', 'ai_processing', 'pending_info'),
+    'under_review': ('approved', 'denied', 'pending_info'),
+    'ai_processing': ('under_review',),
+    'pending_info': ('submitted', 'under_review'),
+    'approved': ('settled',),
+    'appealed': ('under_review',),
+}
+# Claim columns read by the AI outcome actions, keyed by action name
+_AI_OUTCOME_COLUMNS = {
+    'ai_details': ClaimAIDetailSerializer.Meta.fields,
+    'process_status': ('id', 'status', 'ai_recommendation', 'fraud_score'),
+}
+# Audit action recorded for a status change; anything else is 'status_change'
+_STATUS_AUDIT_ACTIONS = {'approved': 'approved', 'denied': 'denied', 'settled': 'settled'}
+# Claimant notification per new status, formatted with the claim's number and settlement
+_STATUS_MESSAGES = {
+    'approved': 'Your claim {number} has been approved.{settlement_note}',
+    'denied': 'Your claim {number} has been denied. '
+              'You may file an appeal if you believe this decision is incorrect.',
+    'settled': 'Your claim {number} has been settled. '
+               'Payment of ${settlement} is being processed.',
+    'pending_info': 'Additional information is needed for claim {number}. '
+                    'Please log in and provide the requested documents.',
+}
+_ROLE_DISPLAY = dict(UserProfile.ROLE_CHOICES)
+
 
 # ==========================================================================
 # Health Check
 # ==========================================================================
 @api_view(['GET'])
+@renderer_classes([ORJSONRenderer])
 @permission_classes([permissions.AllowAny])
 def health_check(request):
     return Response({'status': 'healthy', 'service': 'insurance-backend'})
@@ -67,9 +104,12 @@ def register(request):
 
 @api_view(['GET'])
 def current_user(request):
-    profile, _ = UserProfile.objects.get_or_create(user=request.user)
-    serializer = UserProfileSerializer(profile)
-    return Response(serializer.data)
+    def build():
+        profile, _ = UserProfile.objects.get_or_create(user=request.user)
+        return UserProfileSerializer(profile).data
+
+    # Polled by the frontend; invalidated by the User/UserProfile save signals
+    return Response(cache.get_or_set(UserProfile.cache_key(request.user.id), build, timeout=60))
 
 
 @api_view(['PATCH'])
@@ -138,6 +178,7 @@ def delete_account(request):
 # User Administration (admin / manager only)
 # ==========================================================================
 @api_view(['GET'])
+@renderer_classes([ORJSONRenderer])
 @permission_classes([permissions.IsAuthenticated, CanManageUsers])
 def list_users(request):
     """List all users with their profiles. Managers cannot see admin accounts."""
@@ -145,7 +186,7 @@ def list_users(request):
     search = request.query_params.get('search', '')
     requester_role = _get_role(request.user)
 
-    profiles = UserProfile.objects.select_related('user').all()
+    profiles = UserProfile.objects.all()
 
     # Managers cannot see/manage admin users
     if requester_role == 'manager':
@@ -161,24 +202,31 @@ def list_users(request):
             Q(user__last_name__icontains=search)
         )
 
-    users_data = []
-    for p in profiles.order_by('-created_at'):
-        users_data.append({
-            'id': p.user.id,
-            'username': p.user.username,
-            'email': p.user.email,
-            'first_name': p.user.first_name,
-            'last_name': p.user.last_name,
-            'role': p.role,
-            'role_display': p.get_role_display(),
-            'department': p.department,
-            'phone': p.phone,
-            'is_active': p.user.is_active,
-            'date_joined': p.user.date_joined.isoformat(),
-            'last_login': p.user.last_login.isoformat() if p.user.last_login else None,
-        })
-
-    return Response({'count': len(users_data), 'results': users_data})
+    # Plain rows: skips the password hash and model instantiation for both tables.
+    # Paginated, so only one LIMITed page is ever fetched and built.
+    paginator = StandardPagination()
+    rows = profiles.order_by('-created_at').values(
+        'user_id', 'user__username', 'user__email', 'user__first_name', 'user__last_name',
+        'role', 'department', 'phone', 'user__is_active', 'user__date_joined', 'user__last_login',
+    )
+    users_data = [
+        {
+            'id': r['user_id'],
+            'username': r['user__username'],
+            'email': r['user__email'],
+            'first_name': r['user__first_name'],
+            'last_name': r['user__last_name'],
+            'role': r['role'],
+            'role_display': _ROLE_DISPLAY.get(r['role'], r['role']),
+            'department': r['department'],
+            'phone': r['phone'],
+            'is_active': r['user__is_active'],
+            'date_joined': r['user__date_joined'].isoformat(),
+            'last_login': r['user__last_login'].isoformat() if r['user__last_login'] else None,
+        }
+        for r in paginator.paginate_queryset(rows, request)
+    ]
+    return paginator.get_paginated_response(users_data)
 
 
 @api_view(['POST'])
@@ -215,11 +263,13 @@ def update_user(request, user_id):
     """Update a user's role, status, or profile fields."""
     requester_role = _get_role(request.user)
     try:
-        target_user = User.objects.get(id=user_id)
+        target_user = User.objects.select_related('profile').get(id=user_id)
     except User.DoesNotExist:
         return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
 
-    target_profile, _ = UserProfile.objects.get_or_create(user=target_user)
+    target_profile = getattr(target_user, 'profile', None)
+    if target_profile is None:
+        target_profile, _ = UserProfile.objects.get_or_create(user=target_user)
 
     # Managers cannot modify admin users
     if requester_role == 'manager' and target_profile.role == 'admin':
@@ -241,23 +291,24 @@ def update_user(request, user_id):
         )
 
     # Update User model fields
-    for field in ('first_name', 'last_name', 'email'):
-        if field in request.data:
-            setattr(target_user, field, request.data[field])
-    if 'is_active' in request.data:
-        target_user.is_active = request.data['is_active']
-    target_user.save()
+    user_fields = [f for f in ('first_name', 'last_name', 'email', 'is_active') if f in request.data]
+    for field in user_fields:
+        setattr(target_user, field, request.data[field])
 
     # Update profile fields
-    if 'role' in request.data:
-        valid_roles = [r[0] for r in UserProfile.ROLE_CHOICES]
-        if request.data['role'] in valid_roles:
-            target_profile.role = request.data['role']
-    if 'department' in request.data:
-        target_profile.department = request.data['department']
-    if 'phone' in request.data:
-        target_profile.phone = request.data['phone']
-    target_profile.save()
+    profile_fields = [f for f in ('department', 'phone') if f in request.data]
+    for field in profile_fields:
+        setattr(target_profile, field, request.data[field])
+    if request.data.get('role') in _VALID_ROLES:
+        target_profile.role = request.data['role']
+        profile_fields.append('role')
+
+    # Write only the columns the request touched, both rows in one transaction
+    with transaction.atomic():
+        if user_fields:
+            target_user.save(update_fields=user_fields)
+        if profile_fields:
+            target_profile.save(update_fields=profile_fields)
 
     return Response({
         'id': target_user.id,
@@ -271,44 +322,44 @@ def update_user(request, user_id):
 
 
 @api_view(['GET'])
+@renderer_classes([ORJSONRenderer])
 @permission_classes([permissions.IsAuthenticated, IsStaff])
 def list_staff(request):
     """List staff members available for claim assignment."""
     role_filter = request.query_params.get('role', '')
-    profiles = UserProfile.objects.select_related('user').filter(
+    profiles = UserProfile.objects.filter(
         role__in=('manager', 'adjuster', 'reviewer'),
         user__is_active=True,
     )
     if role_filter:
         profiles = profiles.filter(role=role_filter)
 
-    staff_data = []
-    for p in profiles.order_by('role', 'user__first_name'):
-        staff_data.append({
-            'id': p.user.id,
-            'username': p.user.username,
-            'full_name': p.user.get_full_name() or p.user.username,
-            'role': p.role,
-            'role_display': p.get_role_display(),
-        })
+    rows = profiles.order_by('role', 'user__first_name').values(
+        'user_id', 'user__username', 'user__first_name', 'user__last_name', 'role',
+    )
+    staff_data = [
+        {
+            'id': r['user_id'],
+            'username': r['user__username'],
+            # Same as User.get_full_name()
+            'full_name': f"{r['user__first_name']} {r['user__last_name']}".strip() or r['user__username'],
+            'role': r['role'],
+            'role_display': _ROLE_DISPLAY.get(r['role'], r['role']),
+        }
+        for r in rows
+    ]
     return Response({'results': staff_data})
 
 
-def _get_role(user):
-    """Get role from user profile."""
-    profile = getattr(user, 'profile', None)
-    return profile.role if profile else 'customer'
-
-
 # ==========================================================================
 # Policy Documents
 # ==========================================================================
-class PolicyDocumentViewSet(viewsets.ModelViewSet):
+class PolicyDocumentViewSet(SkipIdleFiltersMixin, viewsets.ModelViewSet):
     queryset = PolicyDocument.objects.all()
     serializer_class = PolicyDocumentSerializer
     permission_classes = [permissions.IsAuthenticated, IsStaffOrReadOnly]
     parser_classes = [MultiPartParser, FormParser]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    filter_backends = [CachedFilterSetBackend, filters.SearchFilter]
     filterset_fields = ['policy_type', 'is_indexed']
     search_fields = ['title']
 
@@ -317,73 +368,96 @@ class PolicyDocumentViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=['post'])
     def index(self, request, pk=None):
-        """Trigger indexing of policy document in ChromaDB."""
+        """Queue indexing of a policy document in ChromaDB; poll the document for ``is_indexed``."""
         policy_doc = self.get_object()
+        file_url = request.build_absolute_uri(policy_doc.document.url)
         try:
-            response = httpx.post(
-                f"{settings.AGENT_SERVICE_URL}/api/index-policy",
-                json={
-                    'document_id': str(policy_doc.id),
-                    'file_url': request.build_absolute_uri(policy_doc.document.url),
-                    'policy_type': policy_doc.policy_type,
-                },
-                timeout=60.0
-            )
-            if response.status_code == 200:
-                result = response.json()
-                policy_doc.is_indexed = True
-                policy_doc.chunk_count = result.get('chunk_count', 0)
-                policy_doc.save()
-                return Response({'status': 'indexed', 'chunks': policy_doc.chunk_count})
-            return Response(
-                {'error': 'Indexing failed'}, status=status.HTTP_502_BAD_GATEWAY
-            )
+            task = index_policy_document_task.delay(str(policy_doc.id), file_url)
         except Exception as e:
-            logger.error(f"Policy indexing error: {e}")
-            return Response(
-                {'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+            # No broker reachable: index in-request as before
+            logger.warning(f"Task queue unavailable ({e}), indexing policy document inline")
+            try:
+                chunks = index_policy_document(policy_doc, file_url)
+            except AgentProcessingError as e:
+                return Response({'error': str(e)}, status=status.HTTP_502_BAD_GATEWAY)
+            except Exception as e:
+                logger.error(f"Policy indexing error: {e}")
+                return Response(
+                    {'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                )
+            return Response({'status': 'indexed', 'chunks': chunks})
+        return Response(
+            {'status': 'indexing', 'task_id': task.id}, status=status.HTTP_202_ACCEPTED
+        )
 
 
 # ==========================================================================
 # Insurance Policies
 # ==========================================================================
-class InsurancePolicyViewSet(viewsets.ModelViewSet):
+class InsurancePolicyViewSet(SkipIdleFiltersMixin, viewsets.ModelViewSet):
     serializer_class = InsurancePolicySerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    filter_backends = [CachedFilterSetBackend, filters.SearchFilter]
     filterset_fields = ['policy_type', 'status']
     search_fields = ['policy_number', 'holder__first_name', 'holder__last_name']
 
     def get_queryset(self):
         user = self.request.user
-        profile = getattr(user, 'profile', None)
-        if profile and profile.role in STAFF_ROLES:
-            return InsurancePolicy.objects.all()
-        return InsurancePolicy.objects.filter(holder=user)
+        qs = InsurancePolicySerializer.setup_eager_loading(InsurancePolicy.objects.all())
+        if _get_role(user) in STAFF_ROLES:
+            return qs
+        return qs.filter(holder=user)
 
 
 # ==========================================================================
 # Claims
 # ==========================================================================
-class ClaimViewSet(viewsets.ModelViewSet):
+def _claim_detail_prefetches():
+    """Child lists nested by ``ClaimDetailSerializer``.
+
+    Children get their ``claim`` set by the reverse prefetch; only user FKs need joining.
+    """
+    return [
+        Prefetch('documents', queryset=ClaimDocument.objects.select_related('uploaded_by')),
+        Prefetch('notes', queryset=ClaimNote.objects.select_related('author')),
+        Prefetch('audit_logs', queryset=AuditLog.objects.select_related('user')),
+        Prefetch('fraud_alerts', queryset=FraudAlert.objects.select_related('reviewed_by')),
+        'agent_tasks',
+    ]
+
+
+class ClaimViewSet(SkipIdleFiltersMixin, viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrStaff]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [CachedFilterSetBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['status', 'priority', 'loss_type']
     search_fields = ['claim_number', 'claimant__first_name', 'claimant__last_name', 'loss_description']
     ordering_fields = ['created_at', 'updated_at', 'priority', 'estimated_repair_cost']
+    # Matches the created_at index so unfiltered lists stay an index scan
+    ordering = ['-created_at']
+    pagination_class = StandardPagination
 
     def get_serializer_class(self):
         if self.action == 'create':
             return ClaimCreateSerializer
         if self.action == 'list':
             return ClaimListSerializer
+        if self.action == 'ai_details':
+            return ClaimAIDetailSerializer
         return ClaimDetailSerializer
 
     def get_queryset(self):
         user = self.request.user
-        profile = getattr(user, 'profile', None)
-        role = profile.role if profile else 'customer'
+        role = _get_role(user)
         qs = Claim.objects.all()
+        if self.action == 'list':
+            qs = ClaimListSerializer.setup_eager_loading(qs.with_list_data())
+        elif self.action in _AI_OUTCOME_COLUMNS:
+            # Only the AI outcome; the claimant is joined for the owner check
+            qs = qs.select_related('claimant').only('claimant', *_AI_OUTCOME_COLUMNS[self.action])
+        else:
+            qs = qs.select_related('claimant', 'policy', 'assigned_adjuster')
+            if self.action == 'retrieve':
+                # The processing log is served separately by ``ai_details``
+                qs = qs.defer('ai_processing_log').prefetch_related(*_claim_detail_prefetches())
 
         if role in ('admin', 'manager'):
             return qs
@@ -399,18 +473,30 @@ class ClaimViewSet(viewsets.ModelViewSet):
             # Customers see only their own claims
             return qs.filter(claimant=user)
 
+    def update(self, request, *args, **kwargs):
+        partial = kwargs.pop('partial', False)
+        instance = self.get_object()
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+        # The detail response nests every child list; load them in bulk rather than per row
+        prefetch_related_objects([instance], *_claim_detail_prefetches())
+        return Response(serializer.data)
+
     def perform_create(self, serializer):
         claim = serializer.save()
-        AuditLog.objects.create(
-            claim=claim, user=self.request.user, action='created',
-            details={'claim_number': claim.claim_number}
-        )
-        Notification.objects.create(
-            user=claim.claimant,
-            notification_type='claim_update',
-            title='Claim Submitted',
-            message=f'Your claim {claim.claim_number} has been submitted successfully.',
-            claim=claim,
+        log_and_notify(
+            audit_logs=[AuditLog(
+                claim=claim, user=self.request.user, action='created',
+                details={'claim_number': claim.claim_number}
+            )],
+            notifications=[Notification(
+                user=claim.claimant,
+                notification_type='claim_update',
+                title='Claim Submitted',
+                message=f'Your claim {claim.claim_number} has been submitted successfully.',
+                claim=claim,
+            )],
         )
 
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated, CanProcessClaims])
@@ -420,223 +506,35 @@ class ClaimViewSet(viewsets.ModelViewSet):
         processing_type = request.data.get('processing_type', 'full')
 
         claim.status = 'ai_processing'
-        claim.save()
-        AuditLog.objects.create(
-            claim=claim, user=request.user, action='ai_processed',
-            details={'processing_type': processing_type}
-        )
-
-        try:
-            claim_data = {
-                'claim_id': str(claim.id),
-                'claim_number': claim.claim_number,
-                'policy_number': claim.policy.policy_number,
-                'claimant_name': claim.claimant.get_full_name(),
-                'date_of_loss': str(claim.date_of_loss),
-                'loss_description': claim.loss_description,
-                'loss_type': claim.loss_type,
-                'estimated_repair_cost': float(claim.estimated_repair_cost),
-                'vehicle_details': claim.vehicle_details,
-                'third_party_involved': claim.third_party_involved,
-                'processing_type': processing_type,
-            }
-
-            response = httpx.post(
-                f"{settings.AGENT_SERVICE_URL}/api/process-claim",
-                json=claim_data,
-                timeout=120.0
+        with transaction.atomic():
+            Claim.objects.filter(pk=claim.pk).set_status(claim.status)
+            AuditLog.objects.create(
+                claim=claim, user=request.user, action='ai_processed',
+                details={'processing_type': processing_type}
             )
 
-            if response.status_code == 200:
-                result = response.json()
-                claim.ai_recommendation = result.get('recommendation', {})
-                claim.fraud_score = result.get('fraud_score')
-                claim.fraud_flags = result.get('fraud_flags', [])
-                claim.ai_processing_log = result.get('processing_log', [])
-
-                if result.get('decision', {}).get('covered'):
-                    claim.status = 'approved'
-                    claim.approved_amount = result['decision'].get('recommended_payout', 0)
-                    claim.deductible_applied = result['decision'].get('deductible', 0)
-                    claim.settlement_amount = max(
-                        0, float(claim.approved_amount or 0) - float(claim.deductible_applied or 0)
-                    )
-                else:
-                    claim.status = 'denied'
-
-                claim.save()
-                return Response({
-                    'status': claim.status,
-                    'recommendation': claim.ai_recommendation,
-                    'fraud_score': claim.fraud_score,
-                })
-            else:
-                claim.status = 'under_review'
-                claim.save()
-                return Response(
-                    {'error': 'Agent processing failed'},
-                    status=status.HTTP_502_BAD_GATEWAY
-                )
+        try:
+            task = process_claim_task.delay(str(claim.id), request.user.id, processing_type)
         except Exception as e:
-            logger.warning(f"Agent service unavailable ({e}), using built-in processor")
-            return self._process_claim_builtin(claim, request.user)
-
-    def _process_claim_builtin(self, claim, user):
-        """Built-in claim processor that works without external AI service."""
-        base_ts = time.time()
-        processing_log = []
-
-        # Step 1: Claim Parsing
-        processing_log.append({
-            'step': 'claim_parsing', 'agent': 'ClaimParser', 'status': 'completed',
-            'duration_ms': random.randint(800, 2000),
-            'result_summary': f'Parsed {claim.loss_type} claim: {claim.loss_description[:60]}...',
-            'timestamp': base_ts,
-        })
-
-        # Step 2: Policy Query Generation
-        processing_log.append({
-            'step': 'policy_query_generation', 'agent': 'PolicyRetriever', 'status': 'completed',
-            'duration_ms': random.randint(400, 1200),
-            'result_summary': f'Generated queries for {claim.loss_type} coverage, deductible terms, exclusions',
-            'timestamp': base_ts + 2,
-        })
-
-        # Step 3: Policy Retrieval
-        processing_log.append({
-            'step': 'policy_retrieval', 'agent': 'PolicyRetriever', 'status': 'completed',
-            'duration_ms': random.randint(800, 2500),
-            'result_summary': 'Retrieved 4 relevant policy sections from knowledge base',
-            'timestamp': base_ts + 5,
-        })
-
-        # Step 4: Fraud Detection
-        fraud_score = round(random.uniform(0.05, 0.45), 2)
-        fraud_flags = []
-        if fraud_score > 0.3:
-            fraud_flags.append({
-                'indicator': 'Elevated Cost Ratio',
-                'description': 'Repair estimate is above average for this damage type',
-                'severity': 'medium',
-            })
-        if claim.third_party_involved:
-            fraud_flags.append({
-                'indicator': 'Third Party Involvement',
-                'description': 'Third party claims require additional verification',
-                'severity': 'low',
-            })
-
-        fraud_label = 'Low risk' if fraud_score < 0.3 else 'Medium risk' if fraud_score < 0.6 else 'High risk'
-        processing_log.append({
-            'step': 'fraud_detection', 'agent': 'FraudDetector', 'status': 'completed',
-            'duration_ms': random.randint(1000, 3500),
-            'result_summary': f'Fraud score: {int(fraud_score * 100)}% - {fraud_label}',
-            'timestamp': base_ts + 9,
-        })
-
-        # Step 5: Recommendation
-        cost = float(claim.estimated_repair_cost)
-        deductible = float(claim.policy.deductible_amount)
-        coverage_limit = float(claim.policy.coverage_limit)
-        covered = cost <= coverage_limit and fraud_score < 0.7
-
-        policy_sections = {
-            'collision': 'Collision Coverage - Section 4.2',
-            'comprehensive': 'Comprehensive Coverage - Section 4.3',
-            'liability': 'Liability Coverage - Section 3.1',
-            'theft': 'Theft & Stolen Vehicle - Section 5.1',
-            'vandalism': 'Vandalism Coverage - Section 5.2',
-            'weather': 'Weather & Natural Disaster - Section 5.3',
-        }
-        policy_section = policy_sections.get(claim.loss_type, 'General Coverage - Section 2.1')
-
-        if covered:
-            settlement = max(0, cost * 0.85 - deductible)
-            rec_summary = (
-                f'Claim is covered under {policy_section}. Based on the reported '
-                f'{claim.get_loss_type_display()} incident, the estimated repair cost of '
-                f'${cost:,.2f} falls within policy limits. After applying the ${deductible:,.2f} '
-                f'deductible, recommended settlement is ${settlement:,.2f}.'
-            )
-        else:
-            settlement = 0
-            rec_summary = (
-                f'After review, this claim does not meet coverage criteria under {policy_section}. '
-                f'The estimated cost exceeds policy limits or fraud indicators suggest further investigation.'
-            )
-
-        processing_log.append({
-            'step': 'recommendation_generation', 'agent': 'RecommendationAgent', 'status': 'completed',
-            'duration_ms': random.randint(1500, 4000),
-            'result_summary': f'{"Approve" if covered else "Deny"}: ${settlement:,.2f} settlement recommended',
-            'timestamp': base_ts + 14,
-        })
-
-        # Step 6: Decision
-        processing_log.append({
-            'step': 'decision_finalization', 'agent': 'DecisionMaker', 'status': 'completed',
-            'duration_ms': random.randint(1000, 3000),
-            'result_summary': f'Final decision: {"Approve" if covered else "Deny"} - {fraud_label}',
-            'timestamp': base_ts + 19,
-        })
-
-        # Update claim
-        claim.ai_recommendation = {
-            'policy_section': policy_section,
-            'recommendation_summary': rec_summary,
-            'deductible': deductible if covered else None,
-            'settlement_amount': settlement if covered else None,
-            'ai_decision': 'approve' if covered else 'deny',
-        }
-        claim.fraud_score = fraud_score
-        claim.fraud_flags = fraud_flags
-        claim.ai_processing_log = processing_log
-
-        # AI sets recommended amounts but puts claim into under_review for human decision
-        if covered:
-            claim.approved_amount = Decimal(str(round(cost * 0.85, 2)))
-            claim.deductible_applied = claim.policy.deductible_amount
-            claim.settlement_amount = max(Decimal('0'), claim.approved_amount - claim.deductible_applied)
-
-        claim.status = 'under_review'
-        claim.save()
-
-        # Create fraud alert if score is elevated
-        if fraud_score > 0.3:
-            FraudAlert.objects.create(
-                claim=claim,
-                severity='medium' if fraud_score < 0.6 else 'high',
-                alert_type='AI Fraud Detection',
-                description=f'Automated fraud analysis flagged this claim with a {int(fraud_score * 100)}% risk score.',
-                indicators=[f['indicator'] for f in fraud_flags],
-                ai_confidence=fraud_score,
-            )
-
-        # Create notification
-        Notification.objects.create(
-            user=claim.claimant,
-            notification_type='claim_update',
-            title=f'Claim {claim.claim_number} AI Review Complete',
-            message=f'Your claim has been analyzed by AI and is now pending human review. '
-                    f'AI recommendation: {"Approve" if covered else "Deny"}.',
-            claim=claim,
+            # No broker reachable: keep the endpoint usable by processing in-request
+            logger.warning(f"Task queue unavailable ({e}), processing claim inline")
+            try:
+                return Response(process_claim(claim, request.user, processing_type))
+            except AgentProcessingError as e:
+                return Response({'error': str(e)}, status=status.HTTP_502_BAD_GATEWAY)
+        return Response(
+            {'status': claim.status, 'task_id': task.id}, status=status.HTTP_202_ACCEPTED
         )
 
-        AuditLog.objects.create(
-            claim=claim, user=user, action='ai_processed',
-            details={
-                'processor': 'built_in',
-                'ai_recommendation': 'approve' if covered else 'deny',
-                'fraud_score': fraud_score,
-                'recommended_settlement': float(settlement),
-            },
-        )
+    @action(detail=True, methods=['get'], url_path='ai-details')
+    def ai_details(self, request, pk=None):
+        """AI recommendation, fraud flags and the agent processing log."""
+        return Response(self.get_serializer(self.get_object()).data)
 
-        return Response({
-            'status': claim.status,
-            'recommendation': claim.ai_recommendation,
-            'fraud_score': claim.fraud_score,
-        })
+    @action(detail=True, methods=['get'], url_path='process-status')
+    def process_status(self, request, pk=None):
+        """Poll the outcome of a queued ``process`` call."""
+        return Response(processing_summary(self.get_object()))
 
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated, CanAssignClaims])
     def assign(self, request, pk=None):
@@ -644,7 +542,10 @@ class ClaimViewSet(viewsets.ModelViewSet):
         claim = self.get_object()
         assignee_id = request.data.get('adjuster_id') or request.data.get('assignee_id')
         try:
-            assignee = User.objects.get(
+            # Just what the audit entry, notification and display cache read
+            assignee = User.objects.select_related('profile').only(
+                'id', 'username', 'first_name', 'last_name', 'profile__role',
+            ).get(
                 id=assignee_id,
                 profile__role__in=('manager', 'adjuster', 'reviewer'),
             )
@@ -652,18 +553,21 @@ class ClaimViewSet(viewsets.ModelViewSet):
             claim.assigned_adjuster = assignee
             if claim.status in ('submitted', 'ai_processing'):
                 claim.status = 'under_review'
-            claim.save()
-            AuditLog.objects.create(
-                claim=claim, user=request.user, action='assigned',
-                old_value={'assignee': str(old_assignee) if old_assignee else None},
-                new_value={'assignee': str(assignee), 'role': assignee.profile.get_role_display()},
-            )
-            Notification.objects.create(
-                user=assignee, notification_type='assignment',
-                title='New Claim Assignment',
-                message=f'You have been assigned claim {claim.claim_number}.',
-                claim=claim,
-            )
+            with transaction.atomic():
+                claim.save(update_fields=['assigned_adjuster', 'adjuster_name_cache', 'status', 'updated_at'])
+                log_and_notify(
+                    audit_logs=[AuditLog(
+                        claim=claim, user=request.user, action='assigned',
+                        old_value={'assignee': str(old_assignee) if old_assignee else None},
+                        new_value={'assignee': str(assignee), 'role': assignee.profile.get_role_display()},
+                    )],
+                    notifications=[Notification(
+                        user=assignee, notification_type='assignment',
+                        title='New Claim Assignment',
+                        message=f'You have been assigned claim {claim.claim_number}.',
+                        claim=claim,
+                    )],
+                )
             return Response({
                 'status': 'assigned',
                 'assignee': assignee.get_full_name(),
@@ -686,28 +590,19 @@ class ClaimViewSet(viewsets.ModelViewSet):
         notes = request.data.get('notes', '')
         requester_role = _get_role(request.user)
 
-        valid_statuses = [s[0] for s in Claim.STATUS_CHOICES]
-        if new_status not in valid_statuses:
+        if new_status not in _VALID_CLAIM_STATUSES:
             return Response(
-                {'error': f'Invalid status. Must be one of: {valid_statuses}'},
+                {'error': f'Invalid status. Must be one of: {list(_STATUS_DISPLAY)}'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
         # Adjusters can only do standard workflow transitions
         if requester_role not in ('admin', 'manager'):
-            allowed_transitions = {
-                'submitted': ['under_review', 'ai_processing', 'pending_info'],
-                'under_review': ['approved', 'denied', 'pending_info'],
-                'ai_processing': ['under_review'],
-                'pending_info': ['submitted', 'under_review'],
-                'approved': ['settled'],
-                'appealed': ['under_review'],
-            }
-            allowed = allowed_transitions.get(claim.status, [])
+            allowed = _ALLOWED_TRANSITIONS.get(claim.status, ())
             if new_status not in allowed:
                 return Response(
                     {'error': f'Cannot transition from {claim.status} to {new_status}. '
-                              f'Allowed: {allowed or "none"}. Contact admin/manager for override.'},
+                              f'Allowed: {list(allowed) or "none"}. Contact admin/manager for override.'},
                     status=status.HTTP_403_FORBIDDEN,
                 )
 
@@ -719,16 +614,7 @@ class ClaimViewSet(viewsets.ModelViewSet):
         if new_status == 'settled' and request.data.get('settlement_amount'):
             claim.settlement_amount = request.data['settlement_amount']
 
-        claim.save()
-
-        # Determine the audit action based on the new status
-        audit_action = 'status_change'
-        if new_status == 'approved':
-            audit_action = 'approved'
-        elif new_status == 'denied':
-            audit_action = 'denied'
-        elif new_status == 'settled':
-            audit_action = 'settled'
+        audit_action = _STATUS_AUDIT_ACTIONS.get(new_status, 'status_change')
 
         # Mark management overrides in the audit trail
         is_override = requester_role in ('admin', 'manager')
@@ -740,31 +626,32 @@ class ClaimViewSet(viewsets.ModelViewSet):
             details['override'] = True
             details['override_by_role'] = requester_role
 
-        AuditLog.objects.create(
+        audit_log = AuditLog(
             claim=claim, user=request.user, action=audit_action,
             old_value={'status': old_status}, new_value={'status': new_status},
             details=details,
         )
 
         # Notify the claimant of status changes
-        status_messages = {
-            'approved': f'Your claim {claim.claim_number} has been approved.'
-                        f'{" Settlement: $" + str(claim.settlement_amount) if claim.settlement_amount else ""}',
-            'denied': f'Your claim {claim.claim_number} has been denied. '
-                      f'You may file an appeal if you believe this decision is incorrect.',
-            'settled': f'Your claim {claim.claim_number} has been settled. '
-                       f'Payment of ${claim.settlement_amount or 0} is being processed.',
-            'pending_info': f'Additional information is needed for claim {claim.claim_number}. '
-                           f'Please log in and provide the requested documents.',
-        }
-        if new_status in status_messages:
-            Notification.objects.create(
+        notifications = []
+        message = _STATUS_MESSAGES.get(new_status)
+        if message:
+            notifications.append(Notification(
                 user=claim.claimant,
                 notification_type='claim_update',
-                title=f'Claim {claim.claim_number} - {dict(Claim.STATUS_CHOICES).get(new_status, new_status)}',
-                message=status_messages[new_status],
+                title=f'Claim {claim.claim_number} - {_STATUS_DISPLAY.get(new_status, new_status)}',
+                message=message.format(
+                    number=claim.claim_number,
+                    settlement=claim.settlement_amount or 0,
+                    settlement_note=(
+                        f' Settlement: ${claim.settlement_amount}' if claim.settlement_amount else ''
+                    ),
+                ),
                 claim=claim,
-            )
+            ))
+        with transaction.atomic():
+            claim.save(update_fields=['status', 'approved_amount', 'settlement_amount', 'updated_at'])
+            log_and_notify(audit_logs=[audit_log], notifications=notifications)
 
         return Response({'status': new_status, 'claim_number': claim.claim_number})
 
@@ -782,6 +669,53 @@ class ClaimViewSet(viewsets.ModelViewSet):
             return Response(ClaimDocumentSerializer(doc).data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=True, methods=['post'], parser_classes=[MultiPartParser, FormParser])
+    def upload_documents(self, request, pk=None):
+        """Upload several documents (multipart ``files``) to a claim in one request."""
+        claim = self.get_object()
+        files = request.FILES.getlist('files')
+        if not files:
+            return Response({'error': 'No files provided'}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = ClaimDocumentSerializer(data=[
+            {
+                'file': f,
+                'filename': f.name,
+                'document_type': request.data.get('document_type', 'other'),
+                'description': request.data.get('description', ''),
+            }
+            for f in files
+        ], many=True)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        docs = [
+            ClaimDocument(**item, claim=claim, uploaded_by=request.user)
+            for item in serializer.validated_data
+        ]
+        try:
+            for doc in docs:
+                doc.commit_file()
+            with transaction.atomic():
+                ClaimDocument.objects.bulk_create(docs, batch_size=100)
+                transaction.on_commit(bump_dashboard_version)
+                AuditLog.objects.create(
+                    claim=claim, user=request.user, action='document_added',
+                    details={
+                        'document_ids': [str(doc.id) for doc in docs],
+                        'filenames': [doc.filename for doc in docs],
+                    },
+                )
+        except Exception:
+            # Don't leave stored files behind without rows pointing at them
+            for doc in docs:
+                if doc.file._committed:
+                    doc.file.delete(save=False)
+            raise
+        return Response(
+            ClaimDocumentSerializer(docs, many=True, context={'request': request}).data,
+            status=status.HTTP_201_CREATED,
+        )
+
     @action(detail=True, methods=['post'])
     def add_note(self, request, pk=None):
         """Add a note to a claim."""
@@ -802,13 +736,15 @@ class ClaimViewSet(viewsets.ModelViewSet):
 # ==========================================================================
 # Fraud Alerts
 # ==========================================================================
-class FraudAlertViewSet(viewsets.ModelViewSet):
-    queryset = FraudAlert.objects.all()
+class FraudAlertViewSet(SkipIdleFiltersMixin, viewsets.ModelViewSet):
     serializer_class = FraudAlertSerializer
     permission_classes = [permissions.IsAuthenticated, CanManageFraudAlerts]
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [CachedFilterSetBackend]
     filterset_fields = ['severity', 'status']
 
+    def get_queryset(self):
+        return FraudAlertSerializer.setup_eager_loading(FraudAlert.objects.all())
+
     @action(detail=True, methods=['post'])
     def resolve(self, request, pk=None):
         alert = self.get_object()
@@ -816,20 +752,30 @@ class FraudAlertViewSet(viewsets.ModelViewSet):
         alert.resolution_notes = request.data.get('notes', '')
         alert.reviewed_by = request.user
         alert.resolved_at = timezone.now()
-        alert.save()
+        alert.save(update_fields=['status', 'resolution_notes', 'reviewed_by', 'resolved_at'])
         return Response(FraudAlertSerializer(alert).data)
 
 
 # ==========================================================================
 # Agent Tasks
 # ==========================================================================
-class AgentTaskViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = AgentTask.objects.all()
-    serializer_class = AgentTaskSerializer
+class AgentTaskViewSet(SkipIdleFiltersMixin, viewsets.ReadOnlyModelViewSet):
     permission_classes = [permissions.IsAuthenticated, IsStaff]
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [CachedFilterSetBackend]
     filterset_fields = ['status', 'agent_type']
 
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return AgentTaskListSerializer
+        return AgentTaskDetailSerializer
+
+    def get_queryset(self):
+        qs = self.get_serializer_class().setup_eager_loading(AgentTask.objects.all())
+        if self.action == 'list':
+            # Skip fetching the large JSON payloads the list serializer never renders
+            return qs.defer('input_data', 'output_data', 'error_message')
+        return qs
+
 
 # ==========================================================================
 # Notifications
@@ -838,7 +784,9 @@ class NotificationViewSet(viewsets.ModelViewSet):
     serializer_class = NotificationSerializer
 
     def get_queryset(self):
-        return Notification.objects.filter(user=self.request.user)
+        return NotificationSerializer.setup_eager_loading(
+            Notification.objects.filter(user=self.request.user)
+        )
 
     @action(detail=False, methods=['post'])
     def mark_all_read(self, request):
@@ -847,9 +795,15 @@ class NotificationViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=['post'])
     def mark_read(self, request, pk=None):
-        notification = self.get_object()
-        notification.is_read = True
-        notification.save()
+        # One UPDATE scoped to the requester's rows, instead of a fetch and full-row save
+        try:
+            updated = Notification.objects.filter(pk=pk, user=request.user).update(is_read=True)
+        except ValidationError:  # malformed id
+            updated = 0
+        if not updated:
+            return Response(
+                {'error': 'Notification not found'}, status=status.HTTP_404_NOT_FOUND
+            )
         return Response({'status': 'read'})
 
 
@@ -857,115 +811,34 @@ class NotificationViewSet(viewsets.ModelViewSet):
 # Dashboard & Analytics
 # ==========================================================================
 @api_view(['GET'])
+@renderer_classes([ORJSONRenderer])
 def dashboard_summary(request):
-    """Get comprehensive dashboard analytics, role-aware."""
-    now = timezone.now()
-    thirty_days_ago = now - timedelta(days=30)
+    """Get comprehensive dashboard analytics, role-aware.
 
+    Admins and managers get the global summary refreshed every minute by
+    beat. Other dashboards are cached for a minute per user; claim, alert and
+    profile writes bump the dashboard version so the next poll recomputes.
+    Management falls back to the same cache when the summary is missing.
+    """
     user = request.user
-    profile = getattr(user, 'profile', None)
-    role = profile.role if profile else 'customer'
-
-    # Scope claims by role
-    if role in ('admin', 'manager'):
-        claims = Claim.objects.all()
-    elif role in ('adjuster', 'reviewer', 'agent'):
-        claims = Claim.objects.all()
-    else:
-        claims = Claim.objects.filter(claimant=user)
-
-    recent_claims = claims.filter(created_at__gte=thirty_days_ago)
-
-    status_counts = dict(claims.values_list('status').annotate(count=Count('id')).values_list('status', 'count'))
-    type_counts = dict(claims.values_list('loss_type').annotate(count=Count('id')).values_list('loss_type', 'count'))
-
-    monthly_trend = list(
-        claims.filter(created_at__gte=now - timedelta(days=365))
-        .annotate(month=TruncMonth('created_at'))
-        .values('month')
-        .annotate(count=Count('id'), total_amount=Sum('estimated_repair_cost'))
-        .order_by('month')
-        .values('month', 'count', 'total_amount')
-    )
-    for item in monthly_trend:
-        item['month'] = item['month'].isoformat()
-        item['total_amount'] = float(item['total_amount'] or 0)
-
-    avg_time = None
-    settled = claims.filter(status='settled', updated_at__isnull=False)
-    if settled.exists():
-        avg_delta = settled.aggregate(
-            avg_time=Avg(F('updated_at') - F('created_at'))
-        )['avg_time']
-        if avg_delta:
-            avg_time = avg_delta.total_seconds() / 3600
-
-    data = {
-        'role': role,
-        'total_claims': claims.count(),
-        'pending_claims': claims.filter(
-            status__in=['submitted', 'under_review', 'ai_processing', 'pending_info']
-        ).count(),
-        'approved_claims': claims.filter(status__in=['approved', 'partially_approved']).count(),
-        'denied_claims': claims.filter(status='denied').count(),
-        'total_payout': float(claims.aggregate(total=Sum('settlement_amount'))['total'] or 0),
-        'avg_processing_time_hours': avg_time or 0,
-        'fraud_alerts_count': FraudAlert.objects.filter(status='open').count(),
-        'claims_by_status': status_counts,
-        'claims_by_type': type_counts,
-        'recent_claims': ClaimListSerializer(
-            recent_claims.order_by('-created_at')[:10], many=True
-        ).data,
-        'monthly_trend': monthly_trend,
-    }
-
-    # Add role-specific data
-    if role in ('adjuster', 'reviewer'):
-        my_claims = Claim.objects.filter(assigned_adjuster=user)
-        data['my_claims_count'] = my_claims.count()
-        data['my_pending_count'] = my_claims.filter(
-            status__in=['submitted', 'under_review', 'ai_processing', 'pending_info']
-        ).count()
-        data['my_recent_claims'] = ClaimListSerializer(
-            my_claims.order_by('-updated_at')[:5], many=True
-        ).data
-    elif role in ('admin', 'manager'):
-        data['total_users'] = User.objects.count()
-        data['total_staff'] = UserProfile.objects.filter(role__in=STAFF_ROLES).count()
-        data['total_adjusters'] = UserProfile.objects.filter(role='adjuster').count()
-        data['unassigned_claims'] = claims.filter(assigned_adjuster__isnull=True).exclude(
-            status__in=['draft', 'closed', 'settled']
-        ).count()
-
-    return Response(data)
+    role = _get_role(user)
+    if role in MANAGEMENT_ROLES:
+        summary = cache.get(DASHBOARD_SUMMARY_KEY)
+        if summary is not None:
+            return Response({**summary, 'role': role})
+    return Response(cache.get_or_set(
+        dashboard_cache_key(user.id, role), lambda: build_dashboard(user, role), timeout=60,
+    ))
 
 
 @api_view(['GET'])
+@renderer_classes([ORJSONRenderer])
 @permission_classes([permissions.IsAuthenticated, CanViewAnalytics])
 def analytics_report(request):
-    """Detailed analytics report."""
+    """Detailed analytics report, cached per period for five minutes."""
     period = request.query_params.get('period', '30')
     days = int(period)
-    start_date = timezone.now() - timedelta(days=days)
-    claims = Claim.objects.filter(created_at__gte=start_date)
+    return Response(cache.get_or_set(
+        analytics_cache_key(days), lambda: build_analytics(days), timeout=300,
+    ))
 
-    return Response({
-        'period_days': days,
-        'total_claims': claims.count(),
-        'by_status': dict(
-            claims.values_list('status').annotate(c=Count('id')).values_list('status', 'c')
-        ),
-        'by_type': dict(
-            claims.values_list('loss_type').annotate(c=Count('id')).values_list('loss_type', 'c')
-        ),
-        'by_priority': dict(
-            claims.values_list('priority').annotate(c=Count('id')).values_list('priority', 'c')
-        ),
-        'total_estimated': float(claims.aggregate(t=Sum('estimated_repair_cost'))['t'] or 0),
-        'total_approved': float(claims.aggregate(t=Sum('approved_amount'))['t'] or 0),
-        'total_settled': float(claims.aggregate(t=Sum('settlement_amount'))['t'] or 0),
-        'avg_fraud_score': claims.exclude(fraud_score__isnull=True).aggregate(
-            avg=Avg('fraud_score')
-        )['avg'],
-        'fraud_alerts': FraudAlert.objects.filter(created_at__gte=start_date).count(),
-    })
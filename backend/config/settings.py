@@ -92,6 +92,22 @@ CACHES = {
     }
 }
 
+# Celery (background claim processing, periodic dashboard refresh)
+CELERY_BROKER_URL = os.environ.get(
+    'CELERY_BROKER_URL', f'redis://{os.environ.get("REDIS_HOST", "redis")}:6379/2'
+)
+CELERY_TASK_ALWAYS_EAGER = os.environ.get('CELERY_TASK_ALWAYS_EAGER', 'False').lower() in ('true', '1', 'yes')
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+CELERY_BEAT_SCHEDULE = {
+    'refresh-dashboard-metrics': {
+        'task': 'claims.tasks.refresh_dashboard_metrics',
+        'schedule': 60.0,
+    },
+}
+
+AUTHENTICATION_BACKENDS = ['claims.authentication.ProfileModelBackend']
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -118,18 +134,18 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'claims.authentication.ProfileJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
     'DEFAULT_FILTER_BACKENDS': (
-        'django_filters.rest_framework.DjangoFilterBackend',
+        'claims.filtering.CachedFilterSetBackend',
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ),
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'claims.pagination.StandardPagination',
     'PAGE_SIZE': 20,
 }
 
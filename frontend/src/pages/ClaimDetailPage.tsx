@@ -8,7 +8,7 @@ import {
 import toast from 'react-hot-toast';
 import api from '../services/api';
 import { useAuth } from '../context/AuthContext';
-import { Claim } from '../types';
+import { Claim, ProcessingLogEntry } from '../types';
 import {
   formatCurrency, formatDate, formatDateTime, statusColor, statusLabel,
   priorityColor, fraudScoreColor, fraudScoreLabel,
@@ -31,6 +31,7 @@ const ClaimDetailPage: React.FC = () => {
   const [activeTab, setActiveTab] = useState('details');
   const [noteContent, setNoteContent] = useState('');
   const [expandedSteps, setExpandedSteps] = useState<Set<number>>(new Set());
+  const [processingLog, setProcessingLog] = useState<ProcessingLogEntry[] | null>(null);
   const navigate = useNavigate();
   const { user } = useAuth();
   const role = user?.role || 'customer';
@@ -53,12 +54,29 @@ const ClaimDetailPage: React.FC = () => {
     }
   }, [id]);
 
+  // The processing log is not part of the claim detail payload; load it when its tab is shown
+  useEffect(() => {
+    if (id && activeTab === 'processing_log') {
+      api.getClaimAIDetails(id).then((res) => setProcessingLog(res.ai_processing_log)).catch(console.error);
+    }
+  }, [id, activeTab, claim?.updated_at]);
+
   const handleAIProcess = async (type: string = 'full') => {
     if (!id) return;
     setProcessing(true);
     try {
-      const result = await api.processClaim(id, type);
-      toast.success(`AI processing complete: ${statusLabel(result.status)}`);
+      let result = await api.processClaim(id, type);
+      // Processing runs in the background worker; poll until it finishes
+      for (let attempt = 0; result.status === 'ai_processing' && attempt < 90; attempt++) {
+        await new Promise((resolve) => setTimeout(resolve, 2000));
+        result = await api.getClaimProcessStatus(id);
+      }
+      // Worker retries can outlast the polling window; only report a finished run
+      if (result.status === 'ai_processing') {
+        toast('AI processing is still running. Check back shortly for the result.');
+      } else {
+        toast.success(`AI processing complete: ${statusLabel(result.status)}`);
+      }
       api.getClaim(id).then(setClaim);
     } catch (err: any) {
       toast.error(err.response?.data?.error || 'Processing failed');
@@ -488,16 +506,16 @@ const ClaimDetailPage: React.FC = () => {
         <div className="card">
           <div className="card-header">
             <h3>AI Agent Processing Pipeline</h3>
-            {claim.ai_processing_log && claim.ai_processing_log.length > 0 && (
+            {processingLog && processingLog.length > 0 && (
               <span style={{ fontSize: '13px', color: '#6b7280' }}>
-                {claim.ai_processing_log.length} agents executed
+                {processingLog.length} agents executed
               </span>
             )}
           </div>
           <div className="card-body">
-            {claim.ai_processing_log && claim.ai_processing_log.length > 0 ? (
+            {processingLog && processingLog.length > 0 ? (
               <div className="processing-steps">
-                {claim.ai_processing_log.map((entry, i) => {
+                {processingLog.map((entry, i) => {
                   const color = agentColors[entry.agent] || '#6b7280';
                   const isExpanded = expandedSteps.has(i);
                   return (
@@ -588,8 +606,8 @@ const ClaimDetailPage: React.FC = () => {
                     Pipeline Complete
                   </span>
                   <span style={{ color: '#166534', fontSize: '13px' }}>
-                    Total: {claim.ai_processing_log.reduce((sum, e) => sum + (e.duration_ms || 0), 0).toLocaleString()}ms
-                    {' | '}{claim.ai_processing_log.filter(e => e.status === 'completed').length}/{claim.ai_processing_log.length} steps completed
+                    Total: {processingLog.reduce((sum, e) => sum + (e.duration_ms || 0), 0).toLocaleString()}ms
+                    {' | '}{processingLog.filter(e => e.status === 'completed').length}/{processingLog.length} steps completed
                   </span>
                 </div>
               </div>
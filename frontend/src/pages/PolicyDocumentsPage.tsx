@@ -72,8 +72,26 @@ const PolicyDocumentsPage: React.FC = () => {
   const handleIndex = async (docId: string) => {
     setIndexingId(docId);
     try {
+      let chunks = 0;
       const result = await api.indexPolicyDocument(docId);
-      toast.success(`Indexed ${result.chunks} chunks into vector store`);
+      if (result.status === 'indexing') {
+        // Indexing runs in the background worker; poll the document until it is marked indexed
+        let indexed = false;
+        for (let attempt = 0; !indexed && attempt < 60; attempt++) {
+          await new Promise((resolve) => setTimeout(resolve, 2000));
+          const doc = await api.getPolicyDocument(docId);
+          indexed = doc.is_indexed;
+          chunks = doc.chunk_count;
+        }
+        if (!indexed) {
+          toast.error('Indexing is still running; check back shortly');
+          fetchDocuments();
+          return;
+        }
+      } else {
+        chunks = result.chunks;
+      }
+      toast.success(`Indexed ${chunks} chunks into vector store`);
       fetchDocuments();
     } catch (err: any) {
       toast.error(err.response?.data?.error || 'Indexing failed');
@@ -42,6 +42,9 @@ const roleBadge = (role: string): React.CSSProperties => {
 const UserAdminPage: React.FC = () => {
   const { user } = useAuth();
   const [users, setUsers] = useState<ManagedUser[]>([]);
+  const [totalUsers, setTotalUsers] = useState(0);
+  const [page, setPage] = useState(1);
+  const [hasNext, setHasNext] = useState(false);
   const [loading, setLoading] = useState(true);
   const [roleFilter, setRoleFilter] = useState('');
   const [search, setSearch] = useState('');
@@ -60,26 +63,31 @@ const UserAdminPage: React.FC = () => {
 
   const isAdmin = user?.role === 'admin';
 
-  const fetchUsers = async () => {
+  const fetchUsers = async (pageNum: number = page) => {
     setLoading(true);
     try {
-      const params: Record<string, string> = {};
+      const params: Record<string, string> = { page: String(pageNum) };
       if (roleFilter) params.role = roleFilter;
       if (search) params.search = search;
       const data = await api.getUsers(params);
       setUsers(data.results || []);
+      setTotalUsers(data.count || 0);
+      setHasNext(!!data.next);
     } catch {
       setUsers([]);
+      setTotalUsers(0);
+      setHasNext(false);
     } finally {
       setLoading(false);
     }
   };
 
-  useEffect(() => { fetchUsers(); }, [roleFilter]);
+  useEffect(() => { fetchUsers(page); }, [roleFilter, page]);
 
   const handleSearch = (e: React.FormEvent) => {
     e.preventDefault();
-    fetchUsers();
+    if (page === 1) fetchUsers(1);
+    else setPage(1);
   };
 
   const openEdit = (u: ManagedUser) => {
@@ -242,7 +250,7 @@ const UserAdminPage: React.FC = () => {
         <select
           style={{ ...inputStyle, width: '180px' }}
           value={roleFilter}
-          onChange={(e) => setRoleFilter(e.target.value)}
+          onChange={(e) => { setRoleFilter(e.target.value); setPage(1); }}
         >
           <option value="">All Roles</option>
           {availableRoles.map((r) => (
@@ -259,7 +267,7 @@ const UserAdminPage: React.FC = () => {
           <button type="submit" style={{ ...btnPrimary, padding: '8px 20px' }}>Search</button>
         </form>
         <span style={{ color: '#6b7280', fontSize: '13px', whiteSpace: 'nowrap' }}>
-          {users.length} user{users.length !== 1 ? 's' : ''}
+          {totalUsers} user{totalUsers !== 1 ? 's' : ''}
         </span>
       </div>
 
@@ -340,6 +348,25 @@ const UserAdminPage: React.FC = () => {
           </table>
         )}
       </div>
+      {(page > 1 || hasNext) && (
+        <div style={{ display: 'flex', gap: '8px', justifyContent: 'flex-end', alignItems: 'center', marginTop: '12px' }}>
+          <button
+            style={{ ...btnPrimary, opacity: page > 1 ? 1 : 0.5 }}
+            disabled={page <= 1 || loading}
+            onClick={() => setPage((p) => p - 1)}
+          >
+            Previous
+          </button>
+          <span style={{ color: '#6b7280', fontSize: '13px' }}>Page {page}</span>
+          <button
+            style={{ ...btnPrimary, opacity: hasNext ? 1 : 0.5 }}
+            disabled={!hasNext || loading}
+            onClick={() => setPage((p) => p + 1)}
+          >
+            Next
+          </button>
+        </div>
+      )}
 
       {/* Edit User Modal */}
       {editingUser && (
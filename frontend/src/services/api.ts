@@ -1,6 +1,6 @@
 import axios, { AxiosInstance, InternalAxiosRequestConfig } from 'axios';
 import {
-  AuthTokens, Claim, ClaimDocument, DashboardSummary, FraudAlert,
+  AuthTokens, Claim, ClaimAIDetails, ClaimDocument, DashboardSummary, FraudAlert,
   InsurancePolicy, Notification, PaginatedResponse, PolicyDocument, User, AgentCard,
 } from '../types';
 
@@ -160,6 +160,16 @@ class ApiService {
     return data;
   }
 
+  async getClaimAIDetails(id: string): Promise<ClaimAIDetails> {
+    const { data } = await this.client.get(`/claims/${id}/ai-details/`);
+    return data;
+  }
+
+  async getClaimProcessStatus(id: string): Promise<any> {
+    const { data } = await this.client.get(`/claims/${id}/process-status/`);
+    return data;
+  }
+
   async assignClaim(id: string, adjusterId: number): Promise<any> {
     const { data } = await this.client.post(`/claims/${id}/assign/`, {
       adjuster_id: adjusterId,
@@ -181,6 +191,13 @@ class ApiService {
     return data;
   }
 
+  async uploadClaimDocuments(id: string, formData: FormData): Promise<ClaimDocument[]> {
+    const { data } = await this.client.post(`/claims/${id}/upload_documents/`, formData, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+    });
+    return data;
+  }
+
   async addClaimNote(id: string, content: string, isInternal: boolean = true): Promise<any> {
     const { data } = await this.client.post(`/claims/${id}/add_note/`, {
       content, is_internal: isInternal,
@@ -207,6 +224,11 @@ class ApiService {
     return data;
   }
 
+  async getPolicyDocument(id: string): Promise<PolicyDocument> {
+    const { data } = await this.client.get(`/policy-documents/${id}/`);
+    return data;
+  }
+
   async indexPolicyDocument(id: string): Promise<any> {
     const { data } = await this.client.post(`/policy-documents/${id}/index/`);
     return data;
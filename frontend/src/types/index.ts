@@ -71,7 +71,6 @@ export interface Claim {
   fraud_score: number | null;
   fraud_flags: FraudFlag[];
   ai_recommendation: AIRecommendation | null;
-  ai_processing_log: ProcessingLogEntry[];
   assigned_adjuster: number | null;
   adjuster_name: string | null;
   documents: ClaimDocument[];
@@ -109,6 +108,17 @@ export interface AIRecommendation {
   ai_decision?: 'approve' | 'deny';
 }
 
+export interface ClaimAIDetails {
+  id: string;
+  claim_number: string;
+  status: ClaimStatus;
+  fraud_score: number | null;
+  fraud_flags: FraudFlag[];
+  ai_recommendation: AIRecommendation | null;
+  ai_processing_log: ProcessingLogEntry[];
+  updated_at: string;
+}
+
 export interface ProcessingLogEntry {
   step: string;
   agent: string;